@@ -0,0 +1 @@
+"""Benchmarks for the electric units, run as modules with `python -m`."""
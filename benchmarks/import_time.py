@@ -0,0 +1,60 @@
+"""Check the cold start time of importing the package.
+
+Each statement runs in several fresh interpreters, and the median time, less
+that of an empty interpreter, is compared to a target. The run fails when
+any statement is over its target.
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --target-ms 100
+"""
+from argparse import ArgumentParser
+from statistics import median
+import subprocess
+import sys
+from time import perf_counter
+
+# Each statement, and its default target in milliseconds. The targets are
+# about twice the medians measured on an idle machine (12-26, 60-90,
+# 140-190 and 400-620 ms), so that noise alone doesn't fail a run.
+STATEMENTS = [
+    ("import electric_units", 50),
+    ("from electric_units import NemSettlementPeriod", 180),
+    ("from electric_units import ElectricalEnergy", 400),
+    ("import electric_units.pandas_compat", 1250),
+]
+
+
+def cold_start_seconds(statement, repeat=11):
+    """The median seconds to start an interpreter and run a statement."""
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        subprocess.run([sys.executable, '-c', statement], check=True)
+        times.append(perf_counter() - start)
+    return median(times)
+
+
+def main(argv=None):
+    """Print each statement's import time, failing any over target."""
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--target-ms', type=float,
+                        help="one target for every statement")
+    parser.add_argument('--repeat', type=int, default=11,
+                        help="interpreters to take the median time of")
+    args = parser.parse_args(argv)
+
+    empty = cold_start_seconds('pass', args.repeat)
+    failed = False
+    print(f"{'statement':<50}{'ms':>8}{'target':>8}")
+    for statement, target in STATEMENTS:
+        target = args.target_ms or target
+        import_ms = (cold_start_seconds(statement, args.repeat) - empty) * 1000
+        over = import_ms > target
+        failed = failed or over
+        print(f"{statement:<50}{import_ms:>8.1f}{target:>8.0f}"
+              f"{'  OVER' if over else ''}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
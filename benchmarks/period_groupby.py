@@ -0,0 +1,63 @@
+"""Compare grouping by a settlement period column.
+
+The current arrays factorize on integer period ordinals. They are
+compared against the earlier factorization, which formatted each start as
+an ISO string and parsed every unique string back.
+
+    python -m benchmarks.period_groupby
+"""
+from timeit import timeit
+
+import numpy as np
+from pandas import DataFrame, date_range
+
+from electric_units.pandas_compat import NemSettlementPeriodArray
+
+SIZES = [10000, 100000, 1000000]
+
+
+class LegacyNemSettlementPeriodArray(NemSettlementPeriodArray):
+    """The earlier, string based, factorization of period arrays."""
+
+    @classmethod
+    def _from_factorized(cls, values, original):
+        """Reconstruct an ExtensionArray after factorization."""
+        values = [val.decode('utf-8') for val in values]
+        return cls(values)
+
+    def _values_for_factorize(self):
+        """Factorize to the ISO8601, with TZ, of the start datetime."""
+        starts = np.fromiter((s.start.isoformat() for s in self), '|S25')
+        return np.array(starts, dtype=object, copy=True), np.nan
+
+
+def _frame(array_class, size):
+    """Prices every minute, with the settlement period of each."""
+    moments = date_range('2020-01-01', periods=size, freq='1min')
+    return DataFrame({
+        'prices': np.random.default_rng(0).uniform(0, 300, size),
+        'periods': array_class(moments),
+    })
+
+
+def _groupby_seconds(array_class, size):
+    """Seconds to average prices by period."""
+    frame = _frame(array_class, size)
+
+    def mean_by_period():
+        return frame.groupby('periods').prices.mean()
+
+    return timeit(mean_by_period, number=1)
+
+
+def main():
+    """Print the comparison."""
+    print(f"{'rows':>10}{'legacy s':>12}{'current s':>12}")
+    for size in SIZES:
+        legacy = _groupby_seconds(LegacyNemSettlementPeriodArray, size)
+        current = _groupby_seconds(NemSettlementPeriodArray, size)
+        print(f"{size:>10}{legacy:>12.3f}{current:>12.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""Compare the memory and latency of period objects.
+
+The current, slotted, periods store their start, end and ordinal when
+they are created. They are compared against a copy of the earlier
+classes, which re-derived the start from the moment on every access.
+
+    python -m benchmarks.period_objects
+"""
+from datetime import datetime, timedelta
+from timeit import timeit
+import tracemalloc
+
+from attr import attrs, attrib
+from pytz import timezone
+
+from electric_units import NemSettlementPeriod
+from electric_units.utils.datetime_coercion import datetime_coercion
+
+COUNT = 20000
+
+
+@attrs(frozen=True)
+class LegacyNemSettlementPeriod:
+    """The earlier NemSettlementPeriod, with a property based start."""
+
+    moment = attrib(converter=datetime_coercion, eq=False, repr=False)
+    start_date = attrib(init=False, type=datetime)
+    period_id = attrib(init=False, type=int)
+
+    def __attrs_post_init__(self):
+        """Post hook from attrs."""
+        object.__setattr__(self, "period_id", self._period_id())
+        object.__setattr__(self, "start_date", self.start.date())
+
+    @property
+    def start(self):
+        """Rewind to the start of the half hour."""
+        moment = timezone('Etc/GMT-10').localize(self.moment)
+        mins = moment.minute
+        round_by = mins if mins < 30 else (30 - mins) * -1
+        start = moment - timedelta(minutes=round_by)
+        return start.replace(second=0, microsecond=0)
+
+    @property
+    def end(self):
+        """A Datetime object for the moment at the end of the period."""
+        return self.start + timedelta(minutes=30)
+
+    @property
+    def end_date(self):
+        """The Date the period ended on."""
+        return self.end.date()
+
+    def _period_id(self):
+        """An integer representing the AEMO Period ID within the day."""
+        start_time = self.start.time()
+        return (start_time.hour * 2) + 1 + (start_time.minute >= 30)
+
+
+def _moments():
+    """One moment a minute, so many moments share each period."""
+    first = datetime(2020, 1, 1)
+    return [first + timedelta(minutes=minute) for minute in range(COUNT)]
+
+
+def _bytes_per_instance(period_class, moments):
+    """Memory allocated per period object, in bytes."""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    periods = [period_class(moment) for moment in moments]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del periods
+    return (after - before) / len(moments)
+
+
+def _compare(period_class, moments):
+    """Latency and memory for one period class."""
+    periods = [period_class(moment) for moment in moments]
+
+    def access():
+        for period in periods:
+            _ = (period.start, period.end, period.end_date, period.period_id)
+
+    return {
+        'construct_us': timeit(
+            lambda: [period_class(moment) for moment in moments],
+            number=1) / COUNT * 1e6,
+        'access_us': timeit(access, number=1) / COUNT * 1e6,
+        'dict_key_us': timeit(
+            lambda: {period: None for period in periods},
+            number=1) / COUNT * 1e6,
+        'bytes': _bytes_per_instance(period_class, moments),
+    }
+
+
+def _interned(moments):
+    """Latency of looking up shared, interned, periods."""
+    NemSettlementPeriod.clear_cache()
+    return timeit(lambda: [NemSettlementPeriod.interned(moment)
+                           for moment in moments], number=1) / COUNT * 1e6
+
+
+def main():
+    """Print the comparison."""
+    moments = _moments()
+    legacy = _compare(LegacyNemSettlementPeriod, moments)
+    current = _compare(NemSettlementPeriod, moments)
+
+    print(f"{'':>14}{'legacy':>12}{'current':>12}")
+    for key, value in legacy.items():
+        print(f"{key:>14}{value:>12.2f}{current[key]:>12.2f}")
+    print(f"{'interned_us':>14}{'':>12}{_interned(moments):>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,255 @@
+"""Time and measure the main operations on synthetic meter data.
+
+Each operation runs on datasets of several sizes, and reports its
+throughput and peak traced memory. Results can be saved as a baseline, and
+a later run compared against it, failing when an operation is slower, or
+uses more memory, than the baseline by more than a threshold.
+
+    python -m benchmarks.suite
+    python -m benchmarks.suite --samples 1000,10000000 --meters 1,10000
+    python -m benchmarks.suite --save baseline.json
+    python -m benchmarks.suite --compare baseline.json --threshold 0.25
+
+Everything runs offline, on data generated from a fixed seed.
+"""
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+import json
+import sys
+from time import perf_counter
+import tracemalloc
+
+import numpy as np
+
+from electric_units import (
+    ElectricalEnergy, NemDispatchPeriod, NemSettlementPeriod, WattSample,
+    WattSampleArray)
+from electric_units.electrical_energy import _average_kwh
+from electric_units.meters import by_meter_period
+from electric_units.utils.integration import integrate_by_period
+from electric_units.utils.parallel import integrate_in_chunks
+
+SAMPLES = [1000, 100000, 1000000]
+METERS = [1, 100]
+
+# A meter reads every 30 seconds, from this moment.
+FIRST_NS = np.datetime64('2020-01-01T00:00:00', 'ns').view(np.int64)
+INTERVAL_NS = 30 * 1000 * 1000 * 1000
+
+
+def dataset(samples, meters):
+    """Power samples for a number of meters, as columns.
+
+    Every meter reads at the same moments, with random power. Returns the
+    meter ids, naive AEST epoch ns and watts.
+    """
+    rng = np.random.default_rng(samples + meters)
+    per_meter = -(-samples // meters)
+    meter_ids = np.repeat(np.arange(meters), per_meter)[:samples]
+    epoch_ns = FIRST_NS + (np.tile(np.arange(per_meter), meters)[:samples]
+                           * INTERVAL_NS)
+    watts = rng.uniform(0, 10000, samples)
+    return meter_ids, epoch_ns, watts
+
+
+def _single_meter(data):
+    """A single meter's samples, as an array."""
+    _, epoch_ns, watts = data
+    return WattSampleArray(epoch_ns=epoch_ns, watts=watts)
+
+
+def _sample_objects(data):
+    """Build a `WattSample` per sample."""
+    samples = _single_meter(data)
+    moments = [samples.moment_at(index) for index in range(len(samples))]
+    return lambda: [WattSample(watts=watts, moment=moment)
+                    for watts, moment in zip(samples.watts, moments)]
+
+
+def _period_objects(data):
+    """Build a `NemSettlementPeriod` per sample."""
+    samples = _single_meter(data)
+    moments = [samples.moment_at(index) for index in range(len(samples))]
+    return lambda: [NemSettlementPeriod(moment) for moment in moments]
+
+
+def _average(data):
+    """Integrate one meter's samples into a single energy."""
+    samples = _single_meter(data)
+    return lambda: _average_kwh(samples)
+
+
+def _by_period(data):
+    """Integrate one meter's samples into dispatch periods."""
+    energy = ElectricalEnergy.from_power_samples(_single_meter(data))
+    return lambda: energy.by_period(NemDispatchPeriod)
+
+
+def _integrate(data):
+    """Integrate one meter's samples into dispatch periods, as columns."""
+    _, epoch_ns, watts = data
+    return lambda: integrate_by_period(
+        epoch_ns, watts, period_ns=NemDispatchPeriod.freq_ns(),
+        offset_ns=NemDispatchPeriod.utc_offset_ns())
+
+
+@lru_cache(maxsize=None)
+def _executor():
+    """A pool of a process per CPU, started once and reused."""
+    return ProcessPoolExecutor()
+
+
+def _integrate_in_chunks(data):
+    """Integrate one meter's samples in chunks, in a pool of processes."""
+    _, epoch_ns, watts = data
+    executor = _executor()
+    return lambda: integrate_in_chunks(
+        epoch_ns, watts, period_ns=NemDispatchPeriod.freq_ns(),
+        offset_ns=NemDispatchPeriod.utc_offset_ns(), executor=executor)
+
+
+def _by_meter_period(data):
+    """Integrate every meter's samples into dispatch periods."""
+    meter_ids, epoch_ns, watts = data
+    moments = epoch_ns.view('datetime64[ns]')
+    return lambda: by_meter_period(meter_ids, moments, watts,
+                                   NemDispatchPeriod)
+
+
+def _settlement_periods(data):
+    """List the dispatch periods spanned by one meter's samples."""
+    samples = _single_meter(data)
+    energy = ElectricalEnergy(kwh=1, start=samples.moment_at(0),
+                              end=samples.moment_at(-1))
+    return lambda: list(energy.settlement_periods(NemDispatchPeriod))
+
+
+def _period_array(data):
+    """Build a settlement period array, and factorize it."""
+    # pylint: disable=import-outside-toplevel
+    from pandas import factorize
+    from electric_units.pandas_compat import NemSettlementPeriodArray
+
+    moments = data[1].view('datetime64[ns]')
+    return lambda: factorize(NemSettlementPeriodArray(moments))
+
+
+# Each operation, the most samples to run it on, whether it handles many
+# meters at once, and how to prepare it.
+OPERATIONS = [
+    ('watt_sample_objects', 1000000, False, _sample_objects),
+    ('period_objects', 1000000, False, _period_objects),
+    ('average_kwh', None, False, _average),
+    ('by_period', 1000000, False, _by_period),
+    ('integrate_by_period', None, False, _integrate),
+    ('integrate_in_chunks', None, False, _integrate_in_chunks),
+    ('by_meter_period', None, True, _by_meter_period),
+    ('settlement_periods', 1000000, False, _settlement_periods),
+    ('period_array_factorize', None, True, _period_array),
+]
+
+
+def measure(operation, repeat=3):
+    """The best seconds of several runs, and the peak traced bytes."""
+    seconds = min(_seconds(operation) for _ in range(repeat))
+
+    tracemalloc.start()
+    operation()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def _seconds(operation):
+    """Seconds for one run."""
+    start = perf_counter()
+    operation()
+    return perf_counter() - start
+
+
+def run(sample_sizes, meter_counts, names=None, repeat=3):
+    """Measure each operation on each dataset, printing as it goes.
+
+    Returns the results keyed by operation, samples and meters.
+    """
+    results = {}
+    print(f"{'operation':<24}{'samples':>10}{'meters':>8}"
+          f"{'seconds':>10}{'samples/s':>12}{'peak MB':>10}")
+    for samples in sample_sizes:
+        for meters in meter_counts:
+            if meters > samples:
+                continue
+            data = dataset(samples, meters)
+            for name, most, many_meters, prepare in OPERATIONS:
+                if names and name not in names:
+                    continue
+                if (most is not None and samples > most) or \
+                        (meters > 1 and not many_meters):
+                    continue
+                seconds, peak = measure(prepare(data), repeat=repeat)
+                key = f"{name}/{samples}/{meters}"
+                results[key] = {'seconds': seconds, 'peak_bytes': peak,
+                                'per_second': samples / seconds}
+                print(f"{name:<24}{samples:>10}{meters:>8}{seconds:>10.4f}"
+                      f"{samples / seconds:>12.0f}{peak / 1e6:>10.1f}")
+    return results
+
+
+def regressions(results, baseline, threshold):
+    """Describe each result slower, or larger, than the baseline allows."""
+    found = []
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        for field in ('seconds', 'peak_bytes'):
+            before, after = baseline[key][field], result[field]
+            if before and after > before * (1 + threshold):
+                found.append(f"{key} {field}: {before:.4g} -> {after:.4g} "
+                             f"(+{(after / before) - 1:.0%})")
+    return found
+
+
+def _sizes(text):
+    """A comma separated list of integers."""
+    return [int(size) for size in text.split(',')]
+
+
+def main(argv=None):
+    """Run the suite, then save or compare the results."""
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--samples', type=_sizes, default=SAMPLES,
+                        help="comma separated dataset sizes, in samples")
+    parser.add_argument('--meters', type=_sizes, default=METERS,
+                        help="comma separated numbers of meters")
+    parser.add_argument('--only', type=lambda text: text.split(','),
+                        help="comma separated operations to run")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="runs to take the best time from")
+    parser.add_argument('--save', help="write the results to this file")
+    parser.add_argument('--compare', help="a baseline file to compare to")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="the fraction slower, or larger, that fails")
+    args = parser.parse_args(argv)
+
+    results = run(args.samples, args.meters, args.only, args.repeat)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as baseline_file:
+            json.dump({'created': datetime.now().isoformat(),
+                       'results': results}, baseline_file, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)['results']
+        found = regressions(results, baseline, args.threshold)
+        for regression in found:
+            print(f"REGRESSION {regression}")
+        if found:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,5 +1,45 @@
-"""Package exports."""
-from electric_units.electrical_energy import ElectricalEnergy
-from electric_units.nem_settlement_period import NemSettlementPeriod
-from electric_units.nem_dispatch_period import NemDispatchPeriod
-from electric_units.watt_sample import WattSample
+"""Package exports.
+
+Each export is imported when it is first used, so importing one unit does
+not pay for the others, or for their dependencies.
+"""
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # Static analysis sees the exports, which `__getattr__` imports lazily.
+    from electric_units.electrical_energy import ElectricalEnergy
+    from electric_units.nem_dispatch_period import NemDispatchPeriod
+    from electric_units.nem_settlement_period import NemSettlementPeriod
+    from electric_units.ranges import PeriodRange, period_range
+    from electric_units.watt_sample import WattSample
+    from electric_units.watt_sample_array import WattSampleArray
+
+_EXPORTS = {
+    'ElectricalEnergy': 'electric_units.electrical_energy',
+    'NemSettlementPeriod': 'electric_units.nem_settlement_period',
+    'NemDispatchPeriod': 'electric_units.nem_dispatch_period',
+    'PeriodRange': 'electric_units.ranges',
+    'period_range': 'electric_units.ranges',
+    'WattSample': 'electric_units.watt_sample',
+    'WattSampleArray': 'electric_units.watt_sample_array',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    """Import an export on first use."""
+    try:
+        module = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """The module's attributes, including exports not yet imported."""
+    return sorted(set(globals()) | set(__all__))
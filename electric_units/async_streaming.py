@@ -0,0 +1,126 @@
+"""Aggregate many meters' async streams of samples into energy per period."""
+
+import asyncio
+
+from attr import attrs, attrib
+
+from electric_units.electrical_energy import ElectricalEnergy
+from electric_units.streaming import PeriodEnergyAggregator
+
+# Marks the end of a meter's stream on the intake queue.
+_END = object()
+
+
+@attrs(frozen=True)
+class MeterEnergy:
+    """The energy in one period, for one meter.
+
+    Args:
+        meter_id: The meter's key in the streams.
+        energy: The energy in the whole period.
+    """
+
+    meter_id = attrib()
+    energy = attrib(type=ElectricalEnergy)
+
+
+async def fan_in_by_period(  # pylint: disable=too-many-arguments
+        streams, period_class, results, *, batch_size=1000,
+        max_pending=10000, executor=None):
+    """Aggregate async streams of samples, from many meters, by period.
+
+    Each meter's samples are integrated as `stream_by_period` would, and
+    its finished periods are put on `results` as `MeterEnergy` objects.
+    Samples from every stream are gathered on one bounded queue, and taken
+    off it in micro batches. Each batch is integrated in an executor, so
+    the event loop keeps serving the streams meanwhile.
+
+    Streams are read no faster than their samples are integrated: once
+    `max_pending` samples are waiting, reading waits. A bounded `results`
+    queue holds back integration, and reading, in the same way.
+
+    Returns once every stream has ended, and every period is on `results`.
+    When a stream raises, the other streams are no longer read, and its
+    error is raised at once. Periods already on `results` are kept.
+
+    Args:
+        streams: A dict of async iterables of `WattSample` objects, in time
+            order, keyed by meter id.
+        period_class: The period to aggregate into, e.g. NemSettlementPeriod.
+        results: An `asyncio.Queue` to put each `MeterEnergy` on.
+        batch_size: The most samples to integrate in one batch.
+        max_pending: The most samples to read ahead of integration.
+        executor: The executor to integrate in, or None for the loop's
+            default. It must run one batch at a time in this process, such
+            as a thread pool, as the meters' open periods are kept here.
+    """
+    intake = asyncio.Queue(maxsize=max_pending)
+    tasks = [asyncio.ensure_future(_read(meter_id, stream, intake))
+             for meter_id, stream in streams.items()]
+    tasks.append(asyncio.ensure_future(_integrate(
+        intake, len(streams), results, period_class, batch_size=batch_size,
+        executor=executor)))
+    try:
+        done, _ = await asyncio.wait(tasks,
+                                     return_when=asyncio.FIRST_EXCEPTION)
+        for task in done:
+            task.result()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _read(meter_id, stream, intake):
+    """Put a stream's samples on the intake queue, then its end.
+
+    The end is only put once the stream is exhausted, so a reader that
+    fails, or is cancelled, never waits on a full queue.
+    """
+    async for sample in stream:
+        await intake.put((meter_id, sample))
+    await intake.put((meter_id, _END))
+
+
+async def _integrate(  # pylint: disable=too-many-arguments
+        intake, open_streams, results, period_class, *, batch_size,
+        executor):
+    """Integrate batches of samples from the intake queue, until each ends."""
+    loop = asyncio.get_running_loop()
+    aggregators = {}
+    while open_streams:
+        batch = [await intake.get()]
+        while len(batch) < batch_size and not intake.empty():
+            batch.append(intake.get_nowait())
+        open_streams -= sum(sample is _END for _, sample in batch)
+
+        finished = await loop.run_in_executor(
+            executor, _aggregate, batch, aggregators, period_class)
+        for meter_energy in finished:
+            await results.put(meter_energy)
+
+
+def _aggregate(batch, aggregators, period_class):
+    """Integrate a batch of samples, returning the finished periods.
+
+    The samples are grouped by meter, keeping their order, and each
+    meter's group is integrated at once.
+    """
+    groups = {}
+    for meter_id, sample in batch:
+        groups.setdefault(meter_id, []).append(sample)
+
+    finished = []
+    for meter_id, samples in groups.items():
+        aggregator = aggregators.get(meter_id)
+        if aggregator is None:
+            aggregator = aggregators[meter_id] = \
+                PeriodEnergyAggregator(period_class)
+        ended = samples[-1] is _END
+        energies = aggregator.push_many(samples[:-1] if ended else samples)
+        if ended:
+            energies += aggregator.flush()
+            del aggregators[meter_id]
+        finished += [MeterEnergy(meter_id=meter_id, energy=energy)
+                     for energy in energies]
+    return finished
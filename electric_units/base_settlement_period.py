@@ -1,55 +1,156 @@
 """A base SettlementPeriod class to build market specific periods from."""
 
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from time import perf_counter
 from attr import attrs, attrib
 
+from electric_units.utils import instrumentation
 from electric_units.utils.datetime_coercion import datetime_coercion
+from electric_units.utils.epoch import (
+    NS_PER_MINUTE, fixed_offset_ns, from_epoch_ns, to_epoch_ns)
+from electric_units.utils.lru_cache import LRUCache
 
+# Periods shared between every moment within them, keyed by class and ordinal.
+_INTERNED = LRUCache(maxsize=4096)
 
-@attrs(frozen=True)
+
+@attrs(frozen=True, slots=True)
 class BaseSettlementPeriod:
     """A Settlement Period.
 
     Settlement periods have a duration, exist in a timezone, and
     a means of expressing the period as an integer within a day.
 
+    The start, end and ordinal of the period are found once, when it is
+    created. Periods compare and hash by their ordinal.
+
+    Subclasses must set `freq_minutes`, the region's period duration in
+    minutes, as a class attribute, and define `time_zone`.
+
     Args:
         moment: A datetime, or None to use the current time.
     """
 
     moment = attrib(converter=datetime_coercion, eq=False, repr=False)
-    start_date = attrib(init=False, type=datetime)
-    period_id = attrib(init=False, type=int)
+    ordinal = attrib(init=False, type=int, repr=False)
+    start = attrib(init=False, type=datetime, eq=False, repr=False)
+    end = attrib(init=False, type=datetime, eq=False, repr=False)
+    start_date = attrib(init=False, type=date, eq=False)
+    period_id = attrib(init=False, type=int, eq=False)
 
     def __attrs_post_init__(self):
         """Post hook from attrs."""
+        recorder = instrumentation.ACTIVE
+        started = perf_counter() if recorder is not None else None
+
+        ordinal = self.moment_ordinal(self.moment)
+        start = self.ordinal_start(ordinal)
+        object.__setattr__(self, "ordinal", ordinal)
+        object.__setattr__(self, "start", start)
+        object.__setattr__(self, "end",
+                           start + timedelta(minutes=self.freq_minutes))
+        object.__setattr__(self, "start_date", start.date())
         object.__setattr__(self, "period_id", self._period_id())
-        object.__setattr__(self, "start_date", self._start_date())
 
-    @property
-    def freq_minutes(self):
-        """Must be set to the region specific period duration."""
-        raise NotImplementedError
+        if recorder is not None:
+            recorder.record('period.construct', started)
+
+    # The region specific period duration, set by each subclass.
+    freq_minutes = None
 
     @staticmethod
     def time_zone():
         """The default timezone for this region's periods."""
         raise NotImplementedError
 
+    @classmethod
+    def freq_ns(cls):
+        """The period duration, in nanoseconds."""
+        if cls.freq_minutes is None:
+            raise NotImplementedError(
+                f"{cls.__name__} must set freq_minutes")
+        return cls.freq_minutes * NS_PER_MINUTE
+
+    @classmethod
+    def utc_offset_ns(cls):
+        """The offset of this region's clock from UTC, in nanoseconds.
+
+        Periods are counted on a fixed offset clock, so that they can be
+        found with integer arithmetic.
+        """
+        offset = fixed_offset_ns(cls.time_zone())
+        if offset is None:
+            raise ValueError(f"{cls.__name__} needs a fixed offset timezone")
+        return offset
+
+    @classmethod
+    def ordinals(cls, epoch_ns, naive=False):
+        """The ordinal of the period containing each UTC epoch ns.
+
+        An ordinal counts the periods since the epoch, on this region's
+        clock. It works on integers and on int64 arrays. Naive epoch ns
+        count the wall clock, and are assumed to be in this timezone.
+        """
+        if naive:
+            return epoch_ns // cls.freq_ns()
+        return (epoch_ns + cls.utc_offset_ns()) // cls.freq_ns()
+
+    @classmethod
+    def moment_ordinal(cls, moment):
+        """The ordinal of the period containing a single moment."""
+        moment = datetime_coercion(moment)
+        return cls.ordinals(to_epoch_ns(moment), naive=moment.tzinfo is None)
+
+    @classmethod
+    def ordinal_start(cls, ordinal):
+        """The start of the period with this ordinal, in this timezone."""
+        # Ordinals count on the local, fixed offset, clock.
+        local_start = from_epoch_ns(int(ordinal) * cls.freq_ns())
+        return local_start.replace(tzinfo=cls.time_zone())
+
+    @classmethod
+    def from_ordinal(cls, ordinal):
+        """The period with this ordinal.
+
+        Periods are interned: the same instance is returned for an ordinal
+        while it remains in the bounded cache.
+        """
+        key = (cls, int(ordinal))
+        period = _INTERNED.get(key)
+        if period is None:
+            period = cls(cls.ordinal_start(ordinal))
+            _INTERNED.put(key, period)
+        return period
+
+    @classmethod
+    def interned(cls, moment):
+        """The shared period instance containing a moment.
+
+        Every moment within a period maps to one instance, created from the
+        period's start, so the moment it holds is that start.
+        """
+        return cls.from_ordinal(cls.moment_ordinal(moment))
+
+    @staticmethod
+    def cache_info():
+        """Hits, misses, maxsize and size of the interned period cache."""
+        return _INTERNED.info()
+
+    @staticmethod
+    def resize_cache(maxsize):
+        """Set the most periods the interned period cache holds."""
+        _INTERNED.resize(maxsize)
+
+    @staticmethod
+    def clear_cache():
+        """Empty the interned period cache and reset its statistics."""
+        _INTERNED.clear()
+
     @property
     def timezone(self):
         """Pull the timezone into a property of the class."""
         return self.__class__.time_zone()
 
-    @property
-    def end(self):
-        """A Datetime object for the moment at the end of the period."""
-        return self.start + timedelta(minutes=self.freq_minutes)
-
-    def _start_date(self):
-        """The Date the period started on."""
-        return self.start.date()
-
     @property
     def end_date(self):
         """The Date thee period ended on."""
@@ -75,15 +176,6 @@ class BaseSettlementPeriod:
         """Default to UTC now."""
         return datetime.utcnow()
 
-    @property
-    def start(self):
-        """A Datetime object for the moment at the start of the period.
-
-        This object is instantiated with a moment, round this moment down
-        to the start of the period.
-        """
-        raise NotImplementedError
-
     def tz_match(self, moment):
         """Localize the instantiaing moment to match this period."""
         return self.__class__.localize(moment)
@@ -91,9 +183,16 @@ class BaseSettlementPeriod:
     @classmethod
     def localize(cls, moment):
         """Localize a date time to match this period."""
+        recorder = instrumentation.ACTIVE
+        started = perf_counter() if recorder is not None else None
         time_zone = cls.time_zone()
 
         dt_moment = datetime_coercion(moment)
         if dt_moment.tzinfo is not None:
-            return dt_moment.astimezone(time_zone)
-        return time_zone.localize(dt_moment)
+            localized = dt_moment.astimezone(time_zone)
+        else:
+            localized = time_zone.localize(dt_moment)
+
+        if recorder is not None:
+            recorder.record('localize', started)
+        return localized
@@ -1,11 +1,17 @@
 """An amount of energy."""
 
-from collections import defaultdict
-from statistics import mean
-from math import nan
 from attr import attrs, attrib
+from attr.converters import optional
+import numpy as np
 
+from electric_units.ranges import period_range
+from electric_units.utils import instrumentation
 from electric_units.utils.datetime_coercion import datetime_coercion
+from electric_units.utils.gap_fill import fill_gaps
+from electric_units.utils.integration import (
+    integrate_by_period, trapezoid_kwh)
+from electric_units.utils.parallel import integrate_in_chunks
+from electric_units.watt_sample_array import WattSampleArray
 
 
 @attrs(frozen=True)
@@ -15,13 +21,15 @@ class ElectricalEnergy:
     kwh = attrib(type=float, converter=float)
     start = attrib(converter=datetime_coercion)
     end = attrib(converter=datetime_coercion)
-    samples = attrib(type=list, eq=False, repr=False, default=None)
+    samples = attrib(type=WattSampleArray, eq=False, repr=False, default=None,
+                     converter=optional(WattSampleArray.from_samples))
 
     @classmethod
     def from_power_samples(cls, samples):
-        """Create the energy object from a list of power samples.
+        """Create the energy object from power samples.
 
-        The energy is the weighted average of the power.
+        The samples can be a list of `WattSample` objects, or a
+        `WattSampleArray`. The energy is the weighted average of the power.
 
         The time between 2 samples creates a weight for the power,
         and the power being drawn between those 2 samples is the mean of those
@@ -30,14 +38,13 @@ class ElectricalEnergy:
         if len(samples) < 2:
             raise TooFewSamples
 
-        sorted_samples = sorted(samples, key=lambda sample: sample.moment)
-
-        earliest = sorted_samples[0]
-        latest = sorted_samples[-1]
+        with instrumentation.timed('sort'):
+            sorted_samples = WattSampleArray.from_samples(samples).sorted()
 
         kwh = _average_kwh(sorted_samples)
         return cls(kwh=kwh,
-                   start=earliest.moment, end=latest.moment,
+                   start=sorted_samples.moment_at(0),
+                   end=sorted_samples.moment_at(-1),
                    samples=sorted_samples)
 
     @property
@@ -46,75 +53,80 @@ class ElectricalEnergy:
         duration = self.end - self.start
         return duration.seconds
 
-    def by_period(self, period_class):
-        """Summarise the energy use in each whole settlement period."""
+    def by_period(self, period_class, fill='nan', executor=None, chunks=None):
+        """Summarise the energy use in each whole settlement period.
+
+        Args:
+            period_class: The period to aggregate into.
+            fill: How to fill the energy of empty periods between samples,
+                one of 'nan', 'zero', 'linear' or 'carry' (forward).
+            executor: Optionally, a pool of processes, such as a
+                ProcessPoolExecutor, to integrate chunks of the samples in
+                with `integrate_in_chunks`. The result is the same as
+                without.
+            chunks: The number of chunks for the executor, by default the
+                number of CPUs.
+        """
         if self.samples is None:
             return self._spread_energy_across_sps(period_class)
 
-        grouped_power_samples = self._get_samples_by_period(period_class)
+        with instrumentation.timed('sort'):
+            samples = self.samples.sorted().localize(period_class.time_zone())
+        with instrumentation.timed('integrate'):
+            integrals = _integrate(samples, period_class, executor, chunks)
+        with instrumentation.timed('gap_fill'):
+            row_ordinals, row_kwh, rows = fill_gaps(integrals.ordinals,
+                                                    integrals.kwh, fill)
 
         energy_groups = []
-        for period, p_samples in grouped_power_samples.items():
-            p_samples = sorted(p_samples, key=lambda sample: sample.moment)
-
-            first_sample = p_samples[0]
-            last_sample = p_samples[-1]
-
-            if period.tz_match(first_sample.moment) > period.start:
-                start_extra = _extrapolate_constant(period.start, first_sample)
-                p_samples.insert(0, start_extra)
-
-            if period.tz_match(last_sample.moment) < period.end:
-                end_extra = _extrapolate_constant(period.end, last_sample)
-                p_samples.append(end_extra)
-
-            period_energy = self.from_power_samples(p_samples)
-
-            if energy_groups:
-                last_energy = energy_groups[-1]
-                nan_energy = _check_nan_needed(period_energy,
-                                               last_energy,
-                                               period_class)
-                if nan_energy:
-                    energy_groups += nan_energy
-
+        sampled = self._sampled_energies(integrals, samples.time_zone)
+        for period_energy, position, count in zip(
+                sampled, np.cumsum(rows) - rows, rows):
             energy_groups.append(period_energy)
+            # The empty periods before the next period with samples.
+            energy_groups += [
+                self.__class__(
+                    kwh=row_kwh[row],
+                    start=period_class.ordinal_start(row_ordinals[row]),
+                    end=period_class.ordinal_start(row_ordinals[row] + 1))
+                for row in range(position + 1, position + count)]
 
         return energy_groups
 
-    def settlement_periods(self, period_class):
-        """The periods within which this energy is used."""
-        periods = []
-        first_period = period_class(self.start)
-        periods.append(first_period)
-
-        while periods[-1].end < periods[-1].tz_match(self.end):
-            new_period = period_class(periods[-1].end)
-            periods.append(new_period)
+    def _sampled_energies(self, integrals, time_zone):
+        """The energy, with its samples, of each period that has samples."""
+        offsets = integrals.offsets
+        for index, kwh in enumerate(integrals.kwh):
+            lower, upper = offsets[index], offsets[index + 1]
+            period_samples = WattSampleArray(
+                epoch_ns=integrals.epoch_ns[lower:upper],
+                watts=integrals.watts[lower:upper],
+                time_zone=time_zone)
+            yield self.__class__(
+                kwh=kwh,
+                start=period_samples.moment_at(0),
+                end=period_samples.moment_at(-1),
+                samples=period_samples)
 
-        return periods
+    def settlement_periods(self, period_class):
+        """The periods within which this energy is used, as a `PeriodRange`."""
+        return period_range(period_class, self.start, self.end)
 
     def _spread_energy_across_sps(self, period_class):
         """Apply a constant mean power to all SPs within the time bound."""
         energy_groups = []
         settlement_periods = self.settlement_periods(period_class)
         mean_period_energy = self.kwh / len(settlement_periods)
-        for period in settlement_periods:
+        # Period boundaries come from the ordinals, without creating periods.
+        bounds = [period_class.ordinal_start(ordinal)
+                  for ordinal in settlement_periods.ordinals]
+        bounds.append(settlement_periods.end)
+        for start, end in zip(bounds[:-1], bounds[1:]):
             period_energy = self.__class__(
-                kwh=mean_period_energy, start=period.start, end=period.end)
+                kwh=mean_period_energy, start=start, end=end)
             energy_groups.append(period_energy)
         return energy_groups
 
-    def _get_samples_by_period(self, period_class):
-        """Return a dict, keys are the period, values are a list of samples."""
-        power_groups = defaultdict(list)
-        for sample in self.samples:
-            sample_period = sample.settlement_period(period_class)
-            tz_moment = sample_period.tz_match(sample.moment)
-            tz_sample = sample.__class__(watts=sample.watts, moment=tz_moment)
-            power_groups[sample_period].append(tz_sample)
-        return power_groups
-
     def __iter__(self):
         """Iterable."""
         for key in ['kwh', 'start']:
@@ -136,32 +148,25 @@ def _extrapolate_constant(to_time, from_sample):
     return extrapolated_sample
 
 
+def _integrate(samples, period_class, executor=None, chunks=None):
+    """Integrate sorted samples by period, in chunks given an executor."""
+    if executor is None:
+        return integrate_by_period(samples.epoch_ns, samples.watts,
+                                   period_ns=period_class.freq_ns(),
+                                   offset_ns=period_class.utc_offset_ns())
+    return integrate_in_chunks(samples.epoch_ns, samples.watts,
+                               period_ns=period_class.freq_ns(),
+                               offset_ns=period_class.utc_offset_ns(),
+                               executor=executor, chunks=chunks)
+
+
 def _average_kwh(power_samples):
     """Average khw of a group of samples."""
     if len(power_samples) < 2:
         raise TooFewSamples
 
-    kwh = 0
-    for sample_1, sample_2 in zip(power_samples[:-1], power_samples[1:]):
-        watts = mean([sample_1.watts, sample_2.watts])
-        duration = (sample_2.moment - sample_1.moment).seconds
-        kwh += (watts / 1000) * (duration / 3600)
-
-    return kwh
-
-
-def _check_nan_needed(period_energy, last_period_energy, period_class):
-    length_period = period_energy.end - period_energy.start
-    distance_to_last = period_energy.start - last_period_energy.end
-
-    if distance_to_last >= length_period:
-        nan_energy = ElectricalEnergy(kwh=nan,
-                                      start=last_period_energy.end,
-                                      end=period_energy.start).by_period(period_class)
-    else:
-        nan_energy = None
-
-    return nan_energy
+    power_samples = WattSampleArray.from_samples(power_samples)
+    return trapezoid_kwh(power_samples.epoch_ns, power_samples.watts)
 
 
 class TooFewSamples(IndexError):
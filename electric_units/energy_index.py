@@ -0,0 +1,101 @@
+"""Answer many energy queries on one series of power samples."""
+
+from attr import attrs, attrib
+import numpy as np
+
+from electric_units.electrical_energy import ElectricalEnergy, TooFewSamples
+from electric_units.utils.datetime_coercion import coerce_many
+from electric_units.utils.epoch import from_epoch_ns, localize_epoch_ns
+from electric_units.utils.integration import (
+    cumulative_kwh_at, interval_kwh)
+from electric_units.watt_sample_array import WattSampleArray
+
+
+@attrs(frozen=True, eq=False)
+class EnergyIndex:
+    """The running energy of a sorted series of power samples.
+
+    The trapezoidal integral up to each sample is computed once, so the
+    energy between any 2 moments is a subtraction, with the power
+    interpolated at moments between samples. Windows are clipped to the
+    samples, and the results match `ElectricalEnergy.from_power_samples`
+    on the samples within the window, plus interpolated samples at its
+    edges.
+
+    Args:
+        samples: The sorted samples, as a `WattSampleArray`.
+        cumulative_kwh: The energy from the first sample to each sample.
+    """
+
+    samples = attrib()
+    cumulative_kwh = attrib(repr=False)
+
+    @classmethod
+    def from_power_samples(cls, samples):
+        """Index a list of `WattSample` objects, or a `WattSampleArray`."""
+        if len(samples) < 2:
+            raise TooFewSamples
+
+        samples = WattSampleArray.from_samples(samples).sorted()
+        cumulative_kwh = np.zeros(len(samples), dtype=np.float64)
+        np.cumsum(interval_kwh(samples.epoch_ns, samples.watts),
+                  out=cumulative_kwh[1:])
+        return cls(samples=samples, cumulative_kwh=cumulative_kwh)
+
+    @property
+    def total_kwh(self):
+        """The energy of the whole series."""
+        return float(self.cumulative_kwh[-1])
+
+    def energy_between(self, start, end):
+        """The `ElectricalEnergy` between 2 moments.
+
+        Naive moments are assumed to be in the samples' timezone.
+
+        Raises:
+            TooFewSamples: The window is outside the samples.
+        """
+        start_ns, end_ns = self._epoch_ns([start, end])
+        sample_ns = self.samples.epoch_ns
+        if start_ns > end_ns or end_ns < sample_ns[0] or \
+                start_ns > sample_ns[-1]:
+            raise TooFewSamples
+        start_ns, end_ns = np.clip([start_ns, end_ns], sample_ns[0],
+                                   sample_ns[-1])
+
+        kwh = self._cumulative_at(np.array([start_ns, end_ns]))
+        return ElectricalEnergy(
+            kwh=kwh[1] - kwh[0],
+            start=from_epoch_ns(start_ns, self.samples.time_zone),
+            end=from_epoch_ns(end_ns, self.samples.time_zone))
+
+    def kwh_between(self, starts, ends):
+        """The energy, in kWh, of many windows at once.
+
+        Args:
+            starts: A column of window start moments.
+            ends: A column of window end moments, of the same length.
+
+        Returns:
+            A float64 array, 0 where a window is outside the samples.
+        """
+        sample_ns = self.samples.epoch_ns
+        starts_ns = np.clip(self._epoch_ns(starts), sample_ns[0],
+                            sample_ns[-1])
+        ends_ns = np.clip(self._epoch_ns(ends), starts_ns, sample_ns[-1])
+        return self._cumulative_at(ends_ns) - self._cumulative_at(starts_ns)
+
+    def _epoch_ns(self, moments):
+        """The epoch ns of moments, on the samples' clock."""
+        epoch_ns, time_zone = coerce_many(moments)
+        if (time_zone is None) != (self.samples.time_zone is None):
+            if time_zone is not None:
+                raise TypeError(
+                    "can't query naive samples with offset-aware moments")
+            epoch_ns = localize_epoch_ns(epoch_ns, self.samples.time_zone)
+        return epoch_ns
+
+    def _cumulative_at(self, epoch_ns):
+        """The energy from the first sample to each clipped moment."""
+        return cumulative_kwh_at(self.samples.epoch_ns, self.samples.watts,
+                                 self.cumulative_kwh, epoch_ns)
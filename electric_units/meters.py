@@ -0,0 +1,163 @@
+"""Aggregate the power samples of many meters into energy per period."""
+
+from itertools import repeat
+import os
+
+from attr import attrs, attrib
+import numpy as np
+
+from electric_units.electrical_energy import ElectricalEnergy, TooFewSamples
+from electric_units.utils.gap_fill import fill_gaps
+from electric_units.utils.integration import integrate_by_period
+from electric_units.utils.parallel import mapped_rows, shared_columns
+from electric_units.watt_sample_array import WattSampleArray
+
+
+@attrs(frozen=True, eq=False)
+class MeterPeriodEnergies:
+    """The energy in each period, for each of many meters, as columns.
+
+    Rows are sorted by meter, then by period. As with
+    `ElectricalEnergy.by_period`, each meter has a row for every period
+    from its first sample to its last, with a NaN energy where the meter
+    has no samples, or another fill.
+
+    Args:
+        period_class: The period aggregated into.
+        meter_ids: The meter of each row.
+        ordinals: The period ordinal of each row.
+        kwh: The energy of each row.
+    """
+
+    period_class = attrib()
+    meter_ids = attrib(repr=False)
+    ordinals = attrib(repr=False)
+    kwh = attrib(repr=False)
+
+    def __len__(self):
+        """The number of meter and period rows."""
+        return len(self.kwh)
+
+    def periods(self):
+        """The period of each row."""
+        return [self.period_class.from_ordinal(ordinal)
+                for ordinal in self.ordinals]
+
+    def energies(self):
+        """Each meter's `ElectricalEnergy` per period, keyed by meter id.
+
+        The energies match those from `by_period`, without their samples.
+        """
+        energies = {}
+        for meter_id, ordinal, kwh in zip(self.meter_ids.tolist(),
+                                          self.ordinals.tolist(),
+                                          self.kwh.tolist()):
+            energies.setdefault(meter_id, []).append(ElectricalEnergy(
+                kwh=kwh,
+                start=self.period_class.ordinal_start(ordinal),
+                end=self.period_class.ordinal_start(ordinal + 1)))
+        return energies
+
+
+def by_meter_period(  # pylint: disable=too-many-arguments
+        meter_ids, moments, watts, period_class, *, fill='nan',
+        executor=None, chunks=None):
+    """Summarise the energy use of many meters in each whole period.
+
+    The samples of every meter are integrated together, with the same rules
+    as `ElectricalEnergy.by_period`: one sort by meter and time, then one
+    segmented integration that never joins two meters' samples.
+
+    Args:
+        meter_ids: The meter of each sample, as integers or strings.
+        moments: The time of each sample, in any form
+            `WattSampleArray.from_moments` accepts.
+        watts: The power of each sample, in watts.
+        period_class: The period to aggregate into, e.g. NemSettlementPeriod.
+        fill: How to fill the energy of each meter's empty periods, one of
+            'nan', 'zero', 'linear' or 'carry' (forward).
+        executor: Optionally, the caller's pool of processes, such as a
+            ProcessPoolExecutor, to integrate chunks of whole meters in.
+            The samples are shared with it through memory mapped files.
+        chunks: The number of chunks for the executor, by default the
+            number of CPUs.
+
+    Raises:
+        TooFewSamples: A meter has fewer than 2 samples.
+    """
+    unique_ids, codes, epoch_ns, watts = _sorted_columns(
+        meter_ids, moments, watts, period_class)
+
+    bounds = _chunk_bounds(codes, chunks or os.cpu_count() or 1)
+    if executor is None or len(bounds) < 2:
+        codes, ordinals, kwh = _integrate_meters(
+            codes, epoch_ns, watts, period_class, fill)
+    else:
+        with shared_columns(codes, epoch_ns, watts) as columns:
+            results = list(executor.map(
+                _integrate_mapped_meters, repeat(columns), *zip(*bounds),
+                repeat(period_class), repeat(fill)))
+        codes, ordinals, kwh = (np.concatenate(column)
+                                for column in zip(*results))
+
+    return MeterPeriodEnergies(period_class=period_class,
+                               meter_ids=unique_ids[codes],
+                               ordinals=ordinals, kwh=kwh)
+
+
+def _sorted_columns(meter_ids, moments, watts, period_class):
+    """The unique meter ids, and samples sorted by meter code and time."""
+    samples = WattSampleArray.from_moments(moments, watts)
+    samples = samples.localize(period_class.time_zone())
+    unique_ids, codes = np.unique(np.asarray(meter_ids), return_inverse=True)
+    if len(codes) != len(samples):
+        raise ValueError("meter_ids, moments and watts must be equal length")
+    few = unique_ids[np.bincount(codes, minlength=len(unique_ids)) < 2]
+    if len(few) > 0:
+        raise TooFewSamples(
+            f"meters with fewer than 2 samples: {', '.join(map(str, few))}")
+
+    # Sort by meter, then time. lexsort is stable, as by_period's sort is.
+    order = np.lexsort((samples.epoch_ns, codes))
+    return (unique_ids, codes[order], samples.epoch_ns[order],
+            samples.watts[order])
+
+
+def _integrate_mapped_meters(columns, lower, upper, period_class, fill):
+    """Integrate a chunk of whole meters' mapped samples, in a worker."""
+    return _integrate_meters(*mapped_rows(columns, lower, upper),
+                             period_class, fill)
+
+
+def _integrate_meters(codes, epoch_ns, watts, period_class, fill):
+    """Integrate samples sorted by meter code and time, filling gaps.
+
+    Returns the meter code, period ordinal and energy of each row.
+    """
+    if len(codes) == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, np.empty(0, dtype=np.float64)
+
+    meter_starts = np.empty(len(codes), dtype=bool)
+    meter_starts[0] = True
+    np.not_equal(codes[1:], codes[:-1], out=meter_starts[1:])
+
+    integrals = integrate_by_period(epoch_ns, watts,
+                                    period_ns=period_class.freq_ns(),
+                                    offset_ns=period_class.utc_offset_ns(),
+                                    segment_starts=meter_starts)
+    row_ordinals, row_kwh, rows = fill_gaps(
+        integrals.ordinals, integrals.kwh, fill,
+        segment_starts=meter_starts[integrals.first])
+    return np.repeat(codes[integrals.first], rows), row_ordinals, row_kwh
+
+
+def _chunk_bounds(codes, chunks):
+    """Split sorted meter codes into about equal chunks of whole meters."""
+    if len(codes) == 0:
+        return []
+    targets = np.linspace(0, len(codes), chunks + 1)[1:-1].astype(np.int64)
+    # Move each split back to the start of its meter.
+    splits = np.searchsorted(codes, codes[targets], side='left')
+    bounds = np.unique(np.concatenate(([0], splits, [len(codes)])))
+    return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
@@ -1,12 +1,19 @@
 """A SettlementPeriod in the NEM region."""
-from datetime import timedelta
+from datetime import date
 from pytz import timezone
 from attr import attrs
-
 from electric_units.base_settlement_period import BaseSettlementPeriod
+from electric_units.utils.lazy_import import LazyModule
+
+np = LazyModule('numpy')  # pylint: disable=invalid-name
+
+AEST = timezone('Etc/GMT-10')
 
+# The proleptic Gregorian ordinal of the epoch's date, where ordinals count.
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
 
-@attrs(frozen=True)
+
+@attrs(frozen=True, slots=True)
 class NemDispatchPeriod(BaseSettlementPeriod):
     """A NEM Dispatch Period.
 
@@ -19,27 +26,25 @@ class NemDispatchPeriod(BaseSettlementPeriod):
         moment: A datetime, or None to use the current time.
     """
 
-    @property
-    def freq_minutes(self):
-        """A dispatch period is 5 minutes long"""
-        return 5
+    # A dispatch period is 5 minutes long.
+    freq_minutes = 5
 
     @staticmethod
     def time_zone():
         """Australian Eastern Standard Time."""
-        return timezone('Etc/GMT-10')
+        return AEST
 
-    @property
-    def start(self):
-        """Rewind to the start of the 5-minute period."""
-        moment = self.tz_match(self.moment)
+    @classmethod
+    def period_ids(cls, ordinals):
+        """The period ID within the day of each ordinal.
 
-        delta_to_start = timedelta(minutes=moment.minute % self.freq_minutes,
-                                   seconds=moment.second,
-                                   microseconds=moment.microsecond)
-
-        start = moment - delta_to_start
-        return start
+        The same rule as `_period_id`, in integer arithmetic, so it also
+        works on int64 arrays of ordinals. Ordinals count from midnight, so
+        are shifted back by the 48 periods before the 4:00AM reset.
+        """
+        periods_per_day = (24 * 60) // cls.freq_minutes
+        reset = (4 * 60) // cls.freq_minutes
+        return ((ordinals - reset) % periods_per_day) + 1
 
     def _period_id(self):
         """An integer representing the dispatch period in the day.
@@ -59,16 +64,65 @@ class NemDispatchPeriod(BaseSettlementPeriod):
         """String representing the unique interval, DISPATCHINTERVAL in the
         NEM data. Takes the form of a zero-padded date string with a
         period ID at the end. Each day starts at 4:00AM AEST"""
-        start = self.start
-        start_date = start.date()
-
-        # add zero padding to make period_id 3 chars long
-        period_id = str(self.period_id).zfill(3)
-
-        if start.hour < 4 and period_id != "001":
-            start_date = start_date - timedelta(days=1)
-
-        # Concat zero-padded dates and add period id
-        dispatch_interval = "".join([start_date.strftime("%Y%m%d"), period_id])
-
-        return dispatch_interval
+        # `dispatch_intervals` in plain integers, for one period.
+        periods_per_day = (24 * 60) // self.freq_minutes
+        reset = (4 * 60) // self.freq_minutes
+        days, period = divmod(self.ordinal - reset, periods_per_day)
+        day = date.fromordinal(EPOCH_ORDINAL + days)
+        return f"{day.year:04}{day.month:02}{day.day:02}{period + 1:03}"
+
+    @classmethod
+    def dispatch_intervals(cls, ordinals):
+        """DISPATCHINTERVAL numbers, YYYYMMDD then a 3 digit period ID.
+
+        Works on integers and on int64 arrays of ordinals. The trading day
+        starts at 4:00AM, so earlier periods belong to the previous day's
+        date. `.astype(str)` gives the interval strings, as they are always
+        11 digits.
+        """
+        ordinals = np.asarray(ordinals, dtype=np.int64)
+        periods_per_day = (24 * 60) // cls.freq_minutes
+        reset = (4 * 60) // cls.freq_minutes
+        days = ((ordinals - reset) // periods_per_day).astype('datetime64[D]')
+
+        months = days.astype('datetime64[M]')
+        years = months.astype('datetime64[Y]').astype(np.int64) + 1970
+        month = (months.astype(np.int64) % 12) + 1
+        day = (days - months).astype(np.int64) + 1
+
+        yyyymmdd = (years * 10000) + (month * 100) + day
+        return (yyyymmdd * 1000) + cls.period_ids(ordinals)
+
+    @classmethod
+    def dispatch_interval_ordinals(cls, intervals):
+        """The ordinal of each DISPATCHINTERVAL, as strings or integers.
+
+        The inverse of `dispatch_intervals`, in integer arithmetic on the
+        whole column. Raises ValueError for any that are not a valid date
+        and period ID.
+        """
+        intervals = np.asarray(intervals)
+        if intervals.dtype.kind not in 'iu':
+            intervals = intervals.astype(np.int64)
+        yyyymmdd, period_ids = np.divmod(intervals.astype(np.int64), 1000)
+
+        year, month_day = np.divmod(yyyymmdd, 10000)
+        month, day = np.divmod(month_day, 100)
+        days = ((year - 1970).astype('datetime64[Y]').astype('datetime64[M]')
+                + (month - 1)).astype('datetime64[D]') + (day - 1)
+
+        periods_per_day = (24 * 60) // cls.freq_minutes
+        reset = (4 * 60) // cls.freq_minutes
+        ordinals = (days.astype(np.int64) * periods_per_day) + reset + \
+            (period_ids - 1)
+        # Out of range months, days or IDs spill into another interval.
+        invalid = cls.dispatch_intervals(ordinals) != intervals
+        if np.any(invalid):
+            bad = np.ravel(intervals)[np.ravel(invalid)][0]
+            raise ValueError(f"{bad} is not a valid DISPATCHINTERVAL")
+        return ordinals
+
+    @classmethod
+    def from_dispatch_interval(cls, interval):
+        """The period for a DISPATCHINTERVAL string or integer."""
+        return cls.from_ordinal(cls.dispatch_interval_ordinals(interval))
@@ -1,12 +1,13 @@
 """A SettlementPeriod in the NEM region."""
-from datetime import timedelta
 from pytz import timezone
 from attr import attrs
 
 from electric_units.base_settlement_period import BaseSettlementPeriod
 
+AEST = timezone('Etc/GMT-10')
 
-@attrs(frozen=True)
+
+@attrs(frozen=True, slots=True)
 class NemSettlementPeriod(BaseSettlementPeriod):
     """A NEM Settlement Period.
 
@@ -18,30 +19,13 @@ class NemSettlementPeriod(BaseSettlementPeriod):
         moment: A datetime, or None to use the current time.
     """
 
-    @property
-    def freq_minutes(self):
-        """The NEM has 30 minute periods."""
-        return 30
+    # The NEM has 30 minute periods.
+    freq_minutes = 30
 
     @staticmethod
     def time_zone():
         """Australian Eastern Standard Time."""
-        return timezone('Etc/GMT-10')
-
-    @property
-    def start(self):
-        """Rewind to the start of the half hour."""
-        moment = self.tz_match(self.moment)
-
-        mins = moment.minute
-        if mins < 30:
-            round_by = mins
-        else:
-            round_by = (30 - mins) * -1
-
-        start = moment - timedelta(minutes=round_by)
-        start = start.replace(second=0, microsecond=0)
-        return start
+        return AEST
 
     def _period_id(self):
         """An integer representing the AEMO Period ID within the day."""
@@ -54,3 +38,13 @@ class NemSettlementPeriod(BaseSettlementPeriod):
             period_id = period_id + 1
 
         return period_id
+
+    @classmethod
+    def period_ids(cls, ordinals):
+        """The period ID within the day of each ordinal.
+
+        The same rule as `_period_id`, in integer arithmetic, so it also
+        works on int64 arrays of ordinals.
+        """
+        periods_per_day = (24 * 60) // cls.freq_minutes
+        return (ordinals % periods_per_day) + 1
@@ -1,3 +1,6 @@
 """Package exports."""
 from electric_units.pandas_compat.nem_settlement_period import NemSettlementPeriodArray
+from electric_units.pandas_compat.nem_dispatch_period import NemDispatchPeriodArray
 from electric_units.pandas_compat.to_settlement_period import to_settlement_period
+from electric_units.pandas_compat.to_dispatch_period import to_dispatch_period
+from electric_units.pandas_compat.nem_accessor import NemAccessor
@@ -0,0 +1,234 @@
+"""A Pandas ExtensionArray for any region's settlement periods."""
+import numpy as np
+
+from pandas import Index, Series, isna, unique
+from pandas.api.extensions import take
+from pandas.api.indexers import check_array_indexer
+from pandas.api.types import (
+    is_integer, is_list_like, is_scalar, pandas_dtype)
+from pandas.core.arrays import ExtensionArray
+from pandas.core.dtypes.base import ExtensionDtype
+
+from electric_units.base_settlement_period import BaseSettlementPeriod
+from electric_units.utils.datetime_coercion import coerce_many
+
+# The ordinal stored for a missing period.
+NA_ORDINAL = np.iinfo(np.int64).min
+
+# Strings that NumPy reads as NaT, and are missing periods here too.
+NAT_STRINGS = ['', 'NaT', 'nat', 'NAT']
+
+
+class BasePeriodArray(ExtensionArray):
+    """A 1-D array of settlement periods, for a region's period class.
+
+    Periods are stored as an int64 array of their ordinals, with
+    `NA_ORDINAL` for missing values. Period objects are only created when
+    a single value is read.
+
+    Subclasses set `period_class` and `dtype_class`.
+    """
+
+    period_class = BaseSettlementPeriod
+    dtype_class = ExtensionDtype
+
+    def __init__(self, values, dtype=None, copy=False):
+        """Instantiate the array."""
+        ordinals = self._to_ordinals(values)
+        if copy:
+            ordinals = ordinals.copy()
+        self._ordinals = ordinals
+        self._dtype = (dtype or self.dtype_class)()
+
+    @classmethod
+    def from_ordinals(cls, ordinals):
+        """Wrap an int64 array of period ordinals, without copying it."""
+        array = cls.__new__(cls)
+        array._ordinals = np.asarray(ordinals, dtype=np.int64)
+        array._dtype = cls.dtype_class()
+        return array
+
+    @classmethod
+    def _to_ordinals(cls, values):
+        """Period ordinals for periods, moments or strings, NA if missing."""
+        if isinstance(values, cls):
+            return values.ordinals
+
+        period_class = cls.period_class
+        if getattr(getattr(values, 'dtype', None), 'kind', None) == 'M':
+            # NaT is stored as the smallest int64, the same as NA_ORDINAL.
+            epoch_ns, time_zone = coerce_many(values)
+            ordinals = period_class.ordinals(epoch_ns, naive=time_zone is None)
+            return np.where(epoch_ns == NA_ORDINAL, NA_ORDINAL, ordinals)
+
+        values = np.asarray(values, dtype=object)
+        ordinals = np.full(len(values), NA_ORDINAL, dtype=np.int64)
+        present = ~(isna(values) | np.isin(values, NAT_STRINGS))
+        if not present.any():
+            return ordinals
+
+        values = values[present]
+        if isinstance(values[0], BaseSettlementPeriod):
+            ordinals[present] = [
+                period.ordinal if isinstance(period, period_class)
+                else period_class.moment_ordinal(period.start)
+                for period in values]
+        else:
+            epoch_ns, time_zone = coerce_many(list(values))
+            ordinals[present] = period_class.ordinals(
+                epoch_ns, naive=time_zone is None)
+        return ordinals
+
+    @property
+    def ordinals(self):
+        """The int64 ordinal of each period, `NA_ORDINAL` where missing."""
+        return self._ordinals
+
+    def __setitem__(self, key, value):
+        """Set one or more values inplace."""
+        if is_list_like(value):
+            if is_scalar(key):
+                raise ValueError("setting an array element with a sequence.")
+            value = self._to_ordinals(value)
+        else:
+            value = self._to_ordinals([value])[0]
+        self._ordinals[key] = value
+
+    @classmethod
+    def _from_sequence(cls, scalars, dtype=None, copy=False):
+        """Construct a new ExtensionArray from a sequence of scalars."""
+        return cls(scalars, copy=copy)
+
+    @classmethod
+    def _from_sequence_of_strings(cls, strings, dtype=None, copy=False):
+        """Construct a new ExtensionArray from a sequence of strings."""
+        return cls(strings, copy=copy)
+
+    @classmethod
+    def _from_factorized(cls, values, original):
+        """Reconstruct an ExtensionArray after factorization."""
+        return cls.from_ordinals(values)
+
+    def _values_for_factorize(self):
+        """Factorize on the integer period ordinals."""
+        return self._ordinals, NA_ORDINAL
+
+    def _values_for_argsort(self):
+        """Sort on the integer period ordinals."""
+        return self._ordinals
+
+    def unique(self):
+        """The distinct periods, in order of appearance."""
+        return self.from_ordinals(unique(self._ordinals))
+
+    def value_counts(self, dropna=True):
+        """The number of times each period appears, indexed by period."""
+        ordinals = self._ordinals[~self.isna()] if dropna else self._ordinals
+        uniques, counts = np.unique(ordinals, return_counts=True)
+        return Series(counts, index=Index(self.from_ordinals(uniques)))
+
+    def searchsorted(self, value, side='left', sorter=None):
+        """Where periods would be inserted to keep this array sorted."""
+        if is_list_like(value):
+            ordinals = self._to_ordinals(value)
+        else:
+            ordinals = self._to_ordinals([value])[0]
+        return np.searchsorted(self._ordinals, ordinals, side=side,
+                               sorter=sorter)
+
+    def __getitem__(self, item):
+        """Select a subset of self."""
+        if is_integer(item):
+            ordinal = self._ordinals[item]
+            if ordinal == NA_ORDINAL:
+                return self.dtype.na_value
+            return self.period_class.from_ordinal(ordinal)
+
+        if is_list_like(item):
+            item = check_array_indexer(self, item)
+        return self.from_ordinals(self._ordinals[item])
+
+    def __len__(self):
+        """Length of this array."""
+        return len(self._ordinals)
+
+    def __eq__(self, other):
+        """Compare, element-wise, with a period or another array."""
+        if isinstance(other, type(self)):
+            other = other.ordinals
+        elif is_list_like(other):
+            other = self._to_ordinals(other)
+        else:
+            other = self._to_ordinals([other])[0]
+        return (self._ordinals == other) & ~self.isna()
+
+    def __array__(self, dtype=None, copy=None):
+        """An object array of the periods, which is always a new array."""
+        if copy is False:
+            raise ValueError("periods can't be viewed as an array without "
+                             "a copy")
+        return np.array(list(self), dtype=dtype or object)
+
+    @property
+    def nbytes(self):
+        """The byte size of the data."""
+        return self._ordinals.nbytes
+
+    @property
+    def dtype(self):
+        """An instance of 'ExtensionDtype'."""
+        return self._dtype
+
+    def isna(self):
+        """A 1-D array indicating if each value is missing."""
+        return self._ordinals == NA_ORDINAL
+
+    def take(self, indices, allow_fill=False, fill_value=None):
+        """Take elements from an array.
+
+        Relies on the take method defined in pandas:
+        https://github.com/pandas-dev/pandas/blob/e246c3b05924ac1fe083565a765ce847fcad3d91/pandas/core/algorithms.py#L1483
+        """
+        if allow_fill:
+            fill_value = self._to_ordinals([fill_value])[0]
+
+        result = take(
+            self._ordinals, indices, fill_value=fill_value,
+            allow_fill=allow_fill)
+        return self.from_ordinals(result)
+
+    def copy(self):
+        """Return a copy of the array."""
+        return self.from_ordinals(self._ordinals.copy())
+
+    @classmethod
+    def _concat_same_type(cls, to_concat):
+        """Concatenate multiple arrays."""
+        return cls.from_ordinals(
+            np.concatenate([array.ordinals for array in to_concat]))
+
+    def to_period_array(self, array_class):
+        """Convert to an array of another region period class.
+
+        Longer periods contain each shorter period, and shorter periods
+        are the first within each longer period. Both period classes must
+        share a clock.
+        """
+        source, target = self.period_class, array_class.period_class
+        if source.utc_offset_ns() != target.utc_offset_ns():
+            raise ValueError("Period classes must share a UTC offset")
+
+        ordinals = (self._ordinals * source.freq_ns()) // target.freq_ns()
+        return array_class.from_ordinals(
+            np.where(self.isna(), NA_ORDINAL, ordinals))
+
+    def astype(self, dtype, copy=True):
+        """Cast to a dtype, including the dtype of another period array."""
+        dtype = pandas_dtype(dtype)
+        if isinstance(dtype, ExtensionDtype):
+            array_class = dtype.construct_array_type()
+            if issubclass(array_class, BasePeriodArray):
+                if isinstance(self, array_class):
+                    return self.copy() if copy else self
+                return self.to_period_array(array_class)
+        return super().astype(dtype, copy=copy)
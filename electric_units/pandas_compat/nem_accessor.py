@@ -0,0 +1,120 @@
+"""A `.nem` accessor for NEM period attributes of datetime columns."""
+import numpy as np
+
+from pandas import DatetimeIndex, Index, Series, array
+from pandas.api.extensions import (
+    register_index_accessor, register_series_accessor)
+
+from electric_units.nem_dispatch_period import NemDispatchPeriod
+from electric_units.nem_settlement_period import NemSettlementPeriod
+from electric_units.pandas_compat.base_period_array import NA_ORDINAL
+from electric_units.pandas_compat.nem_dispatch_period import (
+    NemDispatchPeriodArray)
+from electric_units.pandas_compat.nem_settlement_period import (
+    NemSettlementPeriodArray)
+from electric_units.utils.datetime_coercion import coerce_many
+
+
+@register_series_accessor('nem')
+@register_index_accessor('nem')
+class NemAccessor:
+    """NEM period attributes of a datetime Series or DatetimeIndex.
+
+    Each attribute is found with datetime64 arithmetic on the whole column,
+    following the same rules as `NemSettlementPeriod` and
+    `NemDispatchPeriod`, without creating a period object per row. Naive
+    datetimes are assumed to be in AEST.
+
+        series.nem.settlement_period_id
+        series.nem.dispatch_interval
+    """
+
+    def __init__(self, pandas_obj):
+        """Read the datetime column as epoch nanoseconds."""
+        if getattr(pandas_obj.dtype, 'kind', None) != 'M':
+            raise AttributeError("Can only use .nem accessor with datetimes")
+        self._obj = pandas_obj
+        self._epoch_ns, time_zone = coerce_many(pandas_obj)
+        self._naive = time_zone is None
+        self._missing = self._epoch_ns == NA_ORDINAL
+
+    def _ordinals(self, period_class):
+        """The period ordinal of each row, `NA_ORDINAL` where missing."""
+        ordinals = period_class.ordinals(self._epoch_ns, naive=self._naive)
+        return np.where(self._missing, NA_ORDINAL, ordinals)
+
+    def _wrap(self, values):
+        """Match the shape, index and name of the accessed object."""
+        if isinstance(self._obj, Index):
+            return Index(values, name=self._obj.name)
+        return Series(values, index=self._obj.index, name=self._obj.name)
+
+    def _integers(self, values):
+        """Integer values, as a nullable array where rows are missing."""
+        if self._missing.any():
+            values = array(values, dtype='Int64')
+            values[self._missing] = None
+        return self._wrap(values)
+
+    def _starts(self, period_class, offset=0):
+        """The start of each row's period, plus `offset` periods, in AEST."""
+        ordinals = self._ordinals(period_class) + offset
+        utc_ns = ordinals * period_class.freq_ns()
+        utc_ns -= period_class.utc_offset_ns()
+        utc_ns[self._missing] = NA_ORDINAL
+        starts = DatetimeIndex(utc_ns.view('datetime64[ns]'))
+        starts = starts.tz_localize('UTC')
+        return self._wrap(starts.tz_convert(period_class.time_zone()))
+
+    @property
+    def settlement_period(self):
+        """The settlement period of each row, as a period array."""
+        return self._wrap(NemSettlementPeriodArray.from_ordinals(
+            self._ordinals(NemSettlementPeriod)))
+
+    @property
+    def settlement_period_id(self):
+        """The AEMO settlement period ID, 1 to 48, of each row."""
+        ordinals = self._ordinals(NemSettlementPeriod)
+        return self._integers(NemSettlementPeriod.period_ids(ordinals))
+
+    @property
+    def settlement_period_start(self):
+        """The start of each row's settlement period."""
+        return self._starts(NemSettlementPeriod)
+
+    @property
+    def settlement_period_end(self):
+        """The end of each row's settlement period."""
+        return self._starts(NemSettlementPeriod, offset=1)
+
+    @property
+    def dispatch_period(self):
+        """The dispatch period of each row, as a period array."""
+        return self._wrap(NemDispatchPeriodArray.from_ordinals(
+            self._ordinals(NemDispatchPeriod)))
+
+    @property
+    def dispatch_period_id(self):
+        """The dispatch period ID, 1 to 288 from 4:00AM, of each row."""
+        ordinals = self._ordinals(NemDispatchPeriod)
+        return self._integers(NemDispatchPeriod.period_ids(ordinals))
+
+    @property
+    def dispatch_period_start(self):
+        """The start of each row's dispatch period."""
+        return self._starts(NemDispatchPeriod)
+
+    @property
+    def dispatch_period_end(self):
+        """The end of each row's dispatch period."""
+        return self._starts(NemDispatchPeriod, offset=1)
+
+    @property
+    def dispatch_interval(self):
+        """The AEMO DISPATCHINTERVAL string of each row's dispatch period."""
+        intervals = NemDispatchPeriod.dispatch_intervals(
+            self._ordinals(NemDispatchPeriod))
+        strings = intervals.astype(str).astype(object)
+        strings[self._missing] = None
+        return self._wrap(strings)
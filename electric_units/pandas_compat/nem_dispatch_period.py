@@ -0,0 +1,57 @@
+"""Pandas DType and Array for NemDispatchPeriod."""
+import numpy as np
+
+from pandas import isna
+from pandas.api.extensions import register_extension_dtype
+from pandas.core.dtypes.base import ExtensionDtype
+
+from electric_units.nem_dispatch_period import NemDispatchPeriod
+from electric_units.pandas_compat.base_period_array import (
+    NA_ORDINAL, BasePeriodArray)
+
+
+@register_extension_dtype
+class NemDispatchPeriodDtype(ExtensionDtype):
+    """A custom data type, to be paired with an ExtensionArray."""
+
+    type = NemDispatchPeriod
+    name = "nem_dispatch_period"
+
+    @classmethod
+    def construct_array_type(cls):
+        """Return the array type associated with this dtype."""
+        return NemDispatchPeriodArray
+
+
+class NemDispatchPeriodArray(BasePeriodArray):
+    """A 1-D array of NEM dispatch periods, stored as int64 ordinals."""
+
+    period_class = NemDispatchPeriod
+    dtype_class = NemDispatchPeriodDtype
+
+    @classmethod
+    def from_dispatch_intervals(cls, intervals):
+        """Create the array from DISPATCHINTERVAL strings or integers.
+
+        The whole column is converted with integer arithmetic, and missing
+        values become missing periods.
+        """
+        intervals = np.asarray(intervals)
+        if intervals.dtype.kind in 'iu':
+            return cls.from_ordinals(
+                NemDispatchPeriod.dispatch_interval_ordinals(intervals))
+
+        ordinals = np.full(len(intervals), NA_ORDINAL, dtype=np.int64)
+        present = ~isna(intervals)
+        ordinals[present] = NemDispatchPeriod.dispatch_interval_ordinals(
+            intervals[present])
+        return cls.from_ordinals(ordinals)
+
+    def dispatch_intervals(self):
+        """The DISPATCHINTERVAL string of each period, None where missing."""
+        missing = self.isna()
+        intervals = NemDispatchPeriod.dispatch_intervals(
+            np.where(missing, 0, self.ordinals))
+        strings = intervals.astype(str).astype(object)
+        strings[missing] = None
+        return strings
@@ -0,0 +1,6 @@
+"""Convert a series."""
+
+
+def to_dispatch_period(extension_array, series_of_strings):
+    """Convert from a series from strings to dispatch period objects."""
+    return extension_array(series_of_strings)
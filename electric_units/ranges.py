@@ -0,0 +1,111 @@
+"""A range of consecutive settlement periods, found with integer arithmetic."""
+
+from collections.abc import Sequence
+
+import numpy as np
+
+from electric_units.utils.datetime_coercion import datetime_coercion
+from electric_units.utils.epoch import to_epoch_ns
+
+
+class PeriodRange(Sequence):
+    """Consecutive periods, from one ordinal up to, not including, another.
+
+    Periods are only created when they are read, so counting, indexing and
+    membership are O(1) however long the range. It compares equal to any
+    sequence of the same periods.
+
+    Args:
+        period_class: The period class, e.g. NemSettlementPeriod.
+        first: The ordinal of the first period.
+        stop: The ordinal after the last period.
+    """
+
+    def __init__(self, period_class, first, stop):
+        """Create the range."""
+        self.period_class = period_class
+        self._ordinals = range(int(first), max(int(first), int(stop)))
+
+    @property
+    def ordinals(self):
+        """The ordinal of each period, as an int64 array.
+
+        A pandas period array can wrap these, with its `from_ordinals`.
+        """
+        return np.arange(self._ordinals.start, self._ordinals.stop,
+                         dtype=np.int64)
+
+    @property
+    def start(self):
+        """The start of the first period."""
+        return self.period_class.ordinal_start(self._ordinals.start)
+
+    @property
+    def end(self):
+        """The end of the last period."""
+        return self.period_class.ordinal_start(self._ordinals.stop)
+
+    def __len__(self):
+        """The number of periods."""
+        return len(self._ordinals)
+
+    def __getitem__(self, item):
+        """A period, or a range of periods for a slice with no step."""
+        if isinstance(item, slice):
+            ordinals = self._ordinals[item]
+            if ordinals.step != 1:
+                raise ValueError("period ranges can't step over periods")
+            return self.__class__(self.period_class, ordinals.start,
+                                  ordinals.stop)
+        return self.period_class.from_ordinal(self._ordinals[item])
+
+    def __contains__(self, period):
+        """Is a period of this class within the range."""
+        return isinstance(period, self.period_class) and \
+            period.ordinal in self._ordinals
+
+    def __eq__(self, other):
+        """Is the other sequence the same periods."""
+        if isinstance(other, PeriodRange):
+            return self.period_class is other.period_class and \
+                self._ordinals == other._ordinals
+        if isinstance(other, Sequence):
+            return len(self) == len(other) and all(
+                mine == theirs for mine, theirs in zip(self, other))
+        return NotImplemented
+
+    def __hash__(self):
+        """Hash by the period class and ordinals."""
+        return hash((self.period_class, self._ordinals))
+
+    def __repr__(self):
+        """Show the class and the first and last periods."""
+        return (f"PeriodRange({self.period_class.__name__}, "
+                f"start={self.start.isoformat()}, end={self.end.isoformat()})")
+
+
+def period_range(period_class, start, end):
+    """The periods from the one holding `start` until one reaches `end`.
+
+    The same periods as stepping from `period_class(start)` to each next
+    period while it ends before `end`, so there is always at least one.
+    Naive moments are assumed to be in the period's timezone.
+
+    Args:
+        period_class: The period class, e.g. NemSettlementPeriod.
+        start: The moment within the first period.
+        end: The moment the last period reaches.
+    """
+    first = period_class.moment_ordinal(start)
+    freq_ns = period_class.freq_ns()
+    stop = -(-_local_epoch_ns(period_class, end) // freq_ns)
+    return PeriodRange(period_class, first, max(stop, first + 1))
+
+
+def _local_epoch_ns(period_class, moment):
+    """A moment's epoch ns on the period's local, fixed offset, clock."""
+    moment = datetime_coercion(moment)
+    epoch_ns = to_epoch_ns(moment)
+    if moment.tzinfo is not None:
+        epoch_ns += period_class.utc_offset_ns()
+    return epoch_ns
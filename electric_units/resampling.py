@@ -0,0 +1,112 @@
+"""Resample irregular power samples onto a uniform grid."""
+
+from datetime import timedelta
+
+from attr import attrs, attrib
+import numpy as np
+
+from electric_units.electrical_energy import ElectricalEnergy, TooFewSamples
+from electric_units.utils.epoch import (
+    NS_PER_SECOND, duration_ns, fixed_offset_ns, from_epoch_ns)
+from electric_units.utils.integration import cumulative_kwh_at, interval_kwh
+from electric_units.watt_sample_array import WattSampleArray
+
+
+@attrs(frozen=True, eq=False)
+class ResampledPower:
+    """The average power, and energy, in each interval of a uniform grid.
+
+    Interval `i` starts at `ordinals[i] * freq_ns - offset_ns`. The first
+    and last intervals may only be partly covered by the samples, and
+    their average power is over the covered part.
+
+    Args:
+        ordinals: The ordinal of each interval, counting from the epoch.
+        freq_ns: The interval duration, in nanoseconds.
+        offset_ns: The offset of the grid's clock from the samples' epoch
+            ns, which are UTC when the samples have a timezone.
+        time_zone: The samples' timezone, or None when naive.
+        watts: The average power in each interval.
+        kwh: The energy in each interval.
+    """
+
+    ordinals = attrib(repr=False)
+    freq_ns = attrib()
+    offset_ns = attrib()
+    time_zone = attrib()
+    watts = attrib(repr=False)
+    kwh = attrib(repr=False)
+
+    def __len__(self):
+        """The number of intervals."""
+        return len(self.kwh)
+
+    @property
+    def epoch_ns(self):
+        """The start of each interval, on the samples' clock."""
+        return (self.ordinals * self.freq_ns) - self.offset_ns
+
+    def samples(self):
+        """The average power of each interval, at its start."""
+        return WattSampleArray(epoch_ns=self.epoch_ns, watts=self.watts,
+                               time_zone=self.time_zone)
+
+    def energies(self):
+        """The `ElectricalEnergy` of each interval."""
+        return [ElectricalEnergy(
+            kwh=kwh,
+            start=from_epoch_ns(start_ns, self.time_zone),
+            end=from_epoch_ns(start_ns + self.freq_ns, self.time_zone))
+                for start_ns, kwh in zip(self.epoch_ns.tolist(),
+                                         self.kwh.tolist())]
+
+
+def resample(samples, freq, rule='trapezoid'):
+    """The average power of samples over each interval of a uniform grid.
+
+    The energy of each interval is the difference of the samples' running
+    integral at its edges, so the whole grid is found in a few passes.
+
+    Args:
+        samples: A list of `WattSample` objects, or a `WattSampleArray`.
+        freq: A timedelta, or a period class such as NemDispatchPeriod.
+            Period classes align the grid with their periods, and report
+            the samples in their timezone. Timedeltas align the grid with
+            the epoch on the samples' wall clock, when they are naive or
+            their timezone has a fixed UTC offset, and otherwise with UTC.
+        rule: How the power between 2 samples is found. 'trapezoid'
+            interpolates it, 'previous' holds the earlier sample's power,
+            and 'next' holds the later sample's.
+    """
+    samples = WattSampleArray.from_samples(samples).sorted()
+    if isinstance(freq, timedelta):
+        freq_ns, offset_ns = duration_ns(freq), 0
+        if samples.time_zone is not None:
+            offset_ns = fixed_offset_ns(samples.time_zone) or 0
+    else:
+        samples = samples.localize(freq.time_zone())
+        freq_ns, offset_ns = freq.freq_ns(), freq.utc_offset_ns()
+    if freq_ns <= 0:
+        raise ValueError("freq must be positive")
+
+    epoch_ns, watts = samples.epoch_ns, samples.watts
+    if len(epoch_ns) < 2 or epoch_ns[0] == epoch_ns[-1]:
+        raise TooFewSamples
+
+    cumulative_kwh = np.zeros(len(epoch_ns), dtype=np.float64)
+    np.cumsum(interval_kwh(epoch_ns, watts, rule), out=cumulative_kwh[1:])
+
+    # The intervals holding the samples, excluding an empty one that only
+    # starts at the last sample.
+    first = (epoch_ns[0] + offset_ns) // freq_ns
+    stop = -((-(epoch_ns[-1] + offset_ns)) // freq_ns)
+    ordinals = np.arange(first, stop, dtype=np.int64)
+
+    edges_ns = np.clip(np.append(ordinals, stop) * freq_ns - offset_ns,
+                       epoch_ns[0], epoch_ns[-1])
+    kwh = np.diff(cumulative_kwh_at(epoch_ns, watts, cumulative_kwh,
+                                    edges_ns, rule))
+    hours = np.diff(edges_ns) / NS_PER_SECOND / 3600
+    return ResampledPower(ordinals=ordinals, freq_ns=freq_ns,
+                          offset_ns=offset_ns, time_zone=samples.time_zone,
+                          watts=kwh * 1000 / hours, kwh=kwh)
@@ -0,0 +1,133 @@
+"""Roll the energy in short periods up into longer periods."""
+
+from attr import attrs, attrib, evolve
+import numpy as np
+
+from electric_units.electrical_energy import ElectricalEnergy
+from electric_units.utils.datetime_coercion import coerce_many
+
+# How to report a longer period that only some shorter periods cover.
+PARTIAL_METHODS = ('nan', 'sum')
+
+
+@attrs(frozen=True, eq=False)
+class PeriodRollup:
+    """The energy in each longer period, summed from its shorter periods.
+
+    Args:
+        period_class: The longer period rolled up into.
+        ordinals: The ordinal of each longer period.
+        kwh: The total energy of the shorter periods with an energy. NaN
+            when none of them has one.
+        coverage: The fraction, 0 to 1, of the shorter periods within each
+            longer period that have an energy.
+        first: The index of each longer period's first shorter period.
+    """
+
+    period_class = attrib()
+    ordinals = attrib(repr=False)
+    kwh = attrib(repr=False)
+    coverage = attrib(repr=False)
+    first = attrib(repr=False)
+
+    def __len__(self):
+        """The number of longer periods."""
+        return len(self.kwh)
+
+    def energies(self):
+        """The `ElectricalEnergy` of each longer period."""
+        return [ElectricalEnergy(
+            kwh=kwh,
+            start=self.period_class.ordinal_start(ordinal),
+            end=self.period_class.ordinal_start(ordinal + 1))
+                for ordinal, kwh in zip(self.ordinals.tolist(),
+                                        self.kwh.tolist())]
+
+
+def period_mapping(source_class, target_class):
+    """How many source periods make up each target period.
+
+    A source ordinal's target ordinal is the source ordinal floor divided
+    by this. Both period classes must share a clock, and the target's
+    duration must be a whole number of source periods.
+    """
+    if source_class.utc_offset_ns() != target_class.utc_offset_ns():
+        raise ValueError("Period classes must share a UTC offset")
+    ratio, remainder = divmod(target_class.freq_ns(), source_class.freq_ns())
+    if ratio < 1 or remainder:
+        raise ValueError(f"{target_class.__name__} is not a whole number of "
+                         f"{source_class.__name__} periods")
+    return ratio
+
+
+def rollup_ordinals(ordinals, kwh, source_class, target_class,
+                    segment_starts=None):
+    """Sum the energy of sorted source periods into target periods.
+
+    The whole column is reduced in one pass, without integrating the
+    samples again. The total is of the source periods' energies, so it
+    differs from `by_period` on the samples where the source periods held
+    a sample's power constant out to their edges.
+
+    Args:
+        ordinals: Sorted int64 ordinals of the source periods.
+        kwh: The energy in each source period, NaN where unknown.
+        source_class: The shorter period, e.g. NemDispatchPeriod.
+        target_class: The longer period, e.g. NemSettlementPeriod.
+        segment_starts: Optional bool array, True where a source period
+            starts a new, independent, series (for example a new meter).
+    """
+    ratio = period_mapping(source_class, target_class)
+    ordinals = np.asarray(ordinals, dtype=np.int64)
+    kwh = np.asarray(kwh, dtype=np.float64)
+    targets = ordinals // ratio
+
+    new_group = np.empty(len(targets), dtype=bool)
+    new_group[:1] = True
+    np.not_equal(targets[1:], targets[:-1], out=new_group[1:])
+    if segment_starts is not None:
+        new_group |= segment_starts
+    first = np.flatnonzero(new_group)
+
+    known = ~np.isnan(kwh)
+    if len(first) == 0:
+        totals = counts = np.empty(0)
+    else:
+        totals = np.add.reduceat(np.where(known, kwh, 0.0), first)
+        counts = np.add.reduceat(known.astype(np.int64), first)
+
+    return PeriodRollup(
+        period_class=target_class,
+        ordinals=targets[first],
+        kwh=np.where(counts > 0, totals, np.nan),
+        coverage=counts / ratio,
+        first=first)
+
+
+def rollup(energies, source_class, target_class, partial='nan'):
+    """Sum the energies from `by_period(source_class)` into target periods.
+
+    Returns an `ElectricalEnergy` per target period, as `by_period` would.
+    A target period is NaN unless all of its source periods have an
+    energy, as a partial sum would undercount it.
+
+    Args:
+        energies: The `ElectricalEnergy` of each sorted source period.
+        source_class: The shorter period, e.g. NemDispatchPeriod.
+        target_class: The longer period, e.g. NemSettlementPeriod.
+        partial: 'nan', or 'sum' to total the source periods that have an
+            energy, however few. `rollup_ordinals` gives their coverage.
+    """
+    if partial not in PARTIAL_METHODS:
+        raise ValueError(
+            f"partial must be one of {', '.join(PARTIAL_METHODS)}")
+    starts_ns, time_zone = coerce_many([energy.start for energy in energies])
+    ordinals = source_class.ordinals(starts_ns, naive=time_zone is None)
+    kwh = np.fromiter((energy.kwh for energy in energies),
+                      dtype=np.float64, count=len(energies))
+
+    result = rollup_ordinals(ordinals, kwh, source_class, target_class)
+    if partial == 'nan':
+        result = evolve(result, kwh=np.where(result.coverage < 1, np.nan,
+                                             result.kwh))
+    return result.energies()
@@ -0,0 +1,203 @@
+"""Power samples stored on disk, and read back through memory maps."""
+
+from importlib import import_module
+import json
+import os
+
+import numpy as np
+
+from electric_units.utils.epoch import to_epoch_ns
+from electric_units.watt_sample_array import WattSampleArray
+
+_EPOCH_NS = 'epoch_ns.i8'
+_WATTS = 'watts.f8'
+_INDEX_ORDINALS = 'index_ordinals.i8'
+_INDEX_OFFSETS = 'index_offsets.i8'
+_META = 'store.json'
+
+_INT64 = np.dtype('<i8')
+_FLOAT64 = np.dtype('<f8')
+
+
+class SampleStore:
+    """A meter's power samples, in a directory of memory mapped columns.
+
+    Samples are kept in time order as raw little endian columns: UTC epoch
+    ns and watts. A sparse index holds the first row of each period with
+    samples. Opening a store maps the files without reading them, and a
+    query only reads the index and the pages of the rows it returns.
+
+    Windows are returned as `WattSampleArray` views of the maps, which can
+    be passed straight to `ElectricalEnergy.from_power_samples`.
+
+    The numbers of samples and of index rows are recorded in `store.json`
+    after each append's columns are written, and only those rows are
+    mapped. Rows left by an append that didn't finish are ignored, and
+    overwritten by the next append.
+
+    Args:
+        path: The store's directory.
+    """
+
+    def __init__(self, path):
+        """Open an existing store."""
+        self.path = path
+        with open(os.path.join(path, _META), encoding='utf-8') as meta_file:
+            meta = json.load(meta_file)
+        module, name = meta['period_class'].split(':')
+        self.period_class = getattr(import_module(module), name)
+        self.epoch_ns = self.watts = None
+        self.index_ordinals = self.index_offsets = None
+        self._map_columns(meta['samples'], meta['periods'])
+
+    @classmethod
+    def create(cls, path, period_class, samples=None):
+        """Create a store, indexed by a period class, and open it.
+
+        Args:
+            path: A new, or empty, directory for the store.
+            period_class: The period to index by, e.g. NemSettlementPeriod.
+            samples: Optionally, the first samples to store.
+        """
+        os.makedirs(path, exist_ok=True)
+        for name in (_EPOCH_NS, _WATTS, _INDEX_ORDINALS, _INDEX_OFFSETS):
+            with open(os.path.join(path, name), 'xb'):
+                pass
+        _write_meta(path, {
+            'period_class': _class_path(period_class),
+            'samples': 0,
+            'periods': 0})
+
+        store = cls(path)
+        if samples is not None:
+            store.append(samples)
+        return store
+
+    def __len__(self):
+        """The number of samples stored."""
+        return len(self.epoch_ns)
+
+    def append(self, samples):
+        """Add samples, which must be later than every stored sample.
+
+        The samples can be a list of `WattSample` objects or a
+        `WattSampleArray`, and are sorted before they are written.
+        """
+        samples = WattSampleArray.from_samples(samples).sorted()
+        samples = samples.localize(self.period_class.time_zone())
+        if len(samples) == 0:
+            return
+        if len(self) > 0 and samples.epoch_ns[0] < self.epoch_ns[-1]:
+            raise ValueError("samples must be later than those stored")
+
+        ordinals = self.period_class.ordinals(samples.epoch_ns)
+        new_period = np.empty(len(ordinals), dtype=bool)
+        new_period[0] = len(self.index_ordinals) == 0 or \
+            ordinals[0] != self.index_ordinals[-1]
+        np.not_equal(ordinals[1:], ordinals[:-1], out=new_period[1:])
+        first = np.flatnonzero(new_period)
+
+        rows, periods = len(self), len(self.index_ordinals)
+        self._write(_EPOCH_NS, rows, samples.epoch_ns.astype(_INT64))
+        self._write(_WATTS, rows, samples.watts.astype(_FLOAT64))
+        self._write(_INDEX_ORDINALS, periods, ordinals[first].astype(_INT64))
+        self._write(_INDEX_OFFSETS, periods, (first + rows).astype(_INT64))
+
+        # Commit the new rows, only once every column holds them.
+        rows += len(samples)
+        periods += len(first)
+        _write_meta(self.path, {
+            'period_class': _class_path(self.period_class),
+            'samples': rows,
+            'periods': periods})
+        self._map_columns(rows, periods)
+
+    def window(self, start, end):
+        """The samples at or after `start`, and before `end`.
+
+        Naive moments are assumed to be in the period's timezone.
+        """
+        lower = self._row(to_epoch_ns(self.period_class.localize(start)))
+        upper = max(lower,
+                    self._row(to_epoch_ns(self.period_class.localize(end))))
+        return self._samples(lower, upper)
+
+    def periods(self, first, last=None):
+        """The samples within whole periods, from `first` to `last`.
+
+        Args:
+            first: The first period.
+            last: The last period, included. Defaults to `first`.
+        """
+        last = first if last is None else last
+        for period in (first, last):
+            if not isinstance(period, self.period_class):
+                raise TypeError(f"periods must be {self.period_class.__name__}"
+                                f", not {period.__class__.__name__}")
+        lower = self._period_row(first.ordinal)
+        upper = max(lower, self._period_row(last.ordinal + 1))
+        return self._samples(lower, upper)
+
+    def _period_row(self, ordinal):
+        """The first row in or after the period with an ordinal."""
+        position = np.searchsorted(self.index_ordinals, ordinal)
+        if position == len(self.index_offsets):
+            return len(self)
+        return int(self.index_offsets[position])
+
+    def _row(self, epoch_ns):
+        """The first row at or after a UTC epoch ns.
+
+        The index narrows the search to one period's rows, so only their
+        pages are read.
+        """
+        ordinal = self.period_class.ordinals(epoch_ns)
+        lower = self._period_row(ordinal)
+        upper = self._period_row(ordinal + 1)
+        return lower + int(np.searchsorted(self.epoch_ns[lower:upper],
+                                           epoch_ns))
+
+    def _samples(self, lower, upper):
+        """A view of rows from `lower` to `upper`."""
+        return WattSampleArray(epoch_ns=self.epoch_ns[lower:upper],
+                               watts=self.watts[lower:upper],
+                               time_zone=self.period_class.time_zone())
+
+    def _map_columns(self, rows, periods):
+        """Map the committed rows of the column files."""
+        self.epoch_ns = _map(self.path, _EPOCH_NS, _INT64, rows)
+        self.watts = _map(self.path, _WATTS, _FLOAT64, rows)
+        self.index_ordinals = _map(self.path, _INDEX_ORDINALS, _INT64,
+                                   periods)
+        self.index_offsets = _map(self.path, _INDEX_OFFSETS, _INT64, periods)
+
+    def _write(self, name, committed, values):
+        """Write raw values to a column file, after its committed rows."""
+        with open(os.path.join(self.path, name), 'r+b') as column_file:
+            column_file.seek(committed * values.itemsize)
+            column_file.truncate()
+            column_file.write(values.tobytes())
+
+
+def _map(path, name, dtype, rows):
+    """Memory map the first rows of a column file, read only."""
+    filename = os.path.join(path, name)
+    if os.path.getsize(filename) < rows * dtype.itemsize:
+        raise ValueError(f"{filename} is shorter than its {rows} rows")
+    if rows == 0:
+        # Empty files can't be mapped.
+        return np.empty(0, dtype=dtype)
+    return np.memmap(filename, dtype=dtype, mode='r', shape=(rows,))
+
+
+def _class_path(period_class):
+    """The module and name a period class is imported by."""
+    return f"{period_class.__module__}:{period_class.__name__}"
+
+
+def _write_meta(path, meta):
+    """Replace the store's metadata, in one step."""
+    filename = os.path.join(path, _META)
+    with open(filename + '.tmp', 'w', encoding='utf-8') as meta_file:
+        json.dump(meta, meta_file)
+    os.replace(filename + '.tmp', filename)
@@ -0,0 +1,328 @@
+"""Aggregate a stream of power samples into energy per period."""
+
+from bisect import bisect_right
+from math import nan
+
+from attr import attrs, attrib
+import numpy as np
+
+from electric_units.electrical_energy import ElectricalEnergy
+from electric_units.utils.epoch import NS_PER_SECOND, duration_ns, to_epoch_ns
+from electric_units.utils.integration import integrate_by_period, interval_kwh
+from electric_units.watt_sample_array import WattSampleArray
+
+
+class PeriodEnergyAggregator:
+    """Integrate power samples into energy per period, as they arrive.
+
+    Follows the same rules as `ElectricalEnergy.by_period`: inside a period
+    the power is interpolated between samples, and held constant from the
+    first and last samples out to the period's edges. Periods without
+    samples are reported with a NaN energy.
+
+    Only the current period's partial energy and the last sample are
+    kept, so memory stays constant however long the stream runs.
+
+    Args:
+        period_class: The period to aggregate into, e.g. NemSettlementPeriod.
+    """
+
+    def __init__(self, period_class):
+        """Start with no open period."""
+        self.period_class = period_class
+        self._ordinal = None
+        self._kwh = 0.0
+        self._last_ns = None
+        self._last_watts = None
+
+    def push(self, sample):
+        """Add one `WattSample`, returning the periods it finished."""
+        epoch_ns = to_epoch_ns(sample.moment)
+        if sample.moment.tzinfo is None:
+            epoch_ns -= self.period_class.utc_offset_ns()
+        return self._push(epoch_ns, sample.watts)
+
+    def push_many(self, samples):
+        """Add a batch of samples, returning the periods they finished.
+
+        The batch can be a list of `WattSample` objects or a
+        `WattSampleArray`, and must be in time order.
+        """
+        samples = WattSampleArray.from_samples(samples)
+        if len(samples) == 0:
+            return []
+        samples = samples.localize(self.period_class.time_zone())
+        epoch_ns, watts = samples.epoch_ns, samples.watts
+        if self._last_ns is not None and epoch_ns[0] < self._last_ns:
+            raise OutOfOrderSample(self._last_ns, epoch_ns[0])
+        if np.any(epoch_ns[1:] < epoch_ns[:-1]):
+            raise OutOfOrderSample(None, None)
+
+        finished = []
+        if self._ordinal is not None:
+            ordinals = self.period_class.ordinals(epoch_ns)
+            within = int(np.searchsorted(ordinals, self._ordinal, side='right'))
+            self._extend(epoch_ns[:within], watts[:within])
+            epoch_ns, watts = epoch_ns[within:], watts[within:]
+            if len(epoch_ns) == 0:
+                return finished
+            finished += self._close(next_ordinal=ordinals[within])
+
+        integrals = integrate_by_period(
+            epoch_ns, watts, period_ns=self.period_class.freq_ns(),
+            offset_ns=self.period_class.utc_offset_ns())
+        offsets = integrals.offsets
+        for index, ordinal in enumerate(integrals.ordinals[:-1]):
+            finished.append(self._energy(ordinal, integrals.kwh[index]))
+            finished += self._nan_energies(ordinal, integrals.ordinals[index + 1])
+
+        # The last period stays open, without its extrapolated end.
+        lower, upper = offsets[-2], offsets[-1] - 1
+        self._ordinal = int(integrals.ordinals[-1])
+        self._kwh = _sequential_sum(interval_kwh(
+            integrals.epoch_ns[lower:upper], integrals.watts[lower:upper]))
+        self._last_ns = int(integrals.epoch_ns[upper - 1])
+        self._last_watts = float(integrals.watts[upper - 1])
+        return finished
+
+    def flush(self):
+        """Finish the open period, extrapolating its last sample to the end."""
+        if self._ordinal is None:
+            return []
+        finished = self._close()
+        self._ordinal = None
+        self._last_ns = None
+        self._last_watts = None
+        return finished
+
+    def _push(self, epoch_ns, watts):
+        """Add one sample, as UTC epoch ns and watts."""
+        if self._last_ns is not None and epoch_ns < self._last_ns:
+            raise OutOfOrderSample(self._last_ns, epoch_ns)
+
+        ordinal = self.period_class.ordinals(epoch_ns)
+        if ordinal == self._ordinal:
+            self._kwh += _kwh(self._last_watts, watts, epoch_ns - self._last_ns)
+            self._last_ns, self._last_watts = epoch_ns, watts
+            return []
+
+        finished = []
+        if self._ordinal is not None:
+            finished = self._close(next_ordinal=ordinal)
+        self._open(ordinal, epoch_ns, watts)
+        return finished
+
+    def _open(self, ordinal, epoch_ns, watts):
+        """Start a period, holding the first sample back to its start."""
+        start_ns = (ordinal * self.period_class.freq_ns()) - \
+            self.period_class.utc_offset_ns()
+        self._ordinal = ordinal
+        self._kwh = 0.0
+        if epoch_ns > start_ns:
+            self._kwh += _kwh(watts, watts, epoch_ns - start_ns)
+        self._last_ns, self._last_watts = epoch_ns, watts
+
+    def _extend(self, epoch_ns, watts):
+        """Add sorted samples that are within the open period."""
+        if len(epoch_ns) == 0:
+            return
+        intervals = interval_kwh(np.append(self._last_ns, epoch_ns),
+                                 np.append(self._last_watts, watts))
+        self._kwh = _sequential_sum(intervals, self._kwh)
+        self._last_ns, self._last_watts = int(epoch_ns[-1]), float(watts[-1])
+
+    def _close(self, next_ordinal=None):
+        """Finish the open period, and any empty periods before the next."""
+        end_ns = ((self._ordinal + 1) * self.period_class.freq_ns()) - \
+            self.period_class.utc_offset_ns()
+        kwh = self._kwh + _kwh(self._last_watts, self._last_watts,
+                               end_ns - self._last_ns)
+        finished = [self._energy(self._ordinal, kwh)]
+        if next_ordinal is not None:
+            finished += self._nan_energies(self._ordinal, next_ordinal)
+        return finished
+
+    def _energy(self, ordinal, kwh):
+        """The energy object for a whole period."""
+        return _period_energy(self.period_class, ordinal, kwh)
+
+    def _nan_energies(self, ordinal, next_ordinal):
+        """NaN energies for the empty periods between two ordinals."""
+        return [self._energy(empty, nan)
+                for empty in range(int(ordinal) + 1, int(next_ordinal))]
+
+
+def stream_by_period(samples, period_class):
+    """Yield the energy in each period of a stream of samples.
+
+    Args:
+        samples: An iterable of `WattSample` objects, or of batches of them
+            (lists or `WattSampleArray` objects), in time order.
+        period_class: The period to aggregate into.
+    """
+    aggregator = PeriodEnergyAggregator(period_class)
+    for item in samples:
+        if isinstance(item, (list, WattSampleArray)):
+            finished = aggregator.push_many(item)
+        else:
+            finished = aggregator.push(item)
+        yield from finished
+    yield from aggregator.flush()
+
+
+@attrs(frozen=True)
+class EnergyRevision:
+    """The energy in a period, as reported by a `WatermarkEnergyAggregator`.
+
+    Args:
+        energy: The energy in the whole period.
+        revision: 0 when the period is first reported, and one more each
+            time late samples change it.
+    """
+
+    energy = attrib(type=ElectricalEnergy)
+    revision = attrib(type=int)
+
+
+class WatermarkEnergyAggregator:
+    """Integrate power samples into energy per period, allowing late samples.
+
+    Periods are integrated as `PeriodEnergyAggregator` does, and reported
+    once a sample arrives in a later period. Samples may arrive out of order
+    by up to `lateness` behind the latest sample: the watermark. Each
+    period's samples are kept, in time order, until the watermark passes its
+    end. A late sample in a period already reported re-integrates only that
+    period, which is reported again as a revision. Samples in a period that
+    ended before the watermark are dropped, and counted in `dropped`.
+
+    The watermark moves after each push, so all of a batch is held to the
+    watermark from before it.
+
+    Args:
+        period_class: The period to aggregate into, e.g. NemSettlementPeriod.
+        lateness: A timedelta, how far samples may trail the latest one.
+    """
+
+    def __init__(self, period_class, lateness):
+        """Start with no open periods."""
+        self.period_class = period_class
+        self.lateness_ns = duration_ns(lateness)
+        self.dropped = 0
+        # The sorted sample times and power in each period, by ordinal.
+        self._periods = {}
+        # The revision last reported for each period, by ordinal.
+        self._revisions = {}
+        self._latest_ns = None
+        self._final = None
+
+    @property
+    def watermark(self):
+        """The watermark, in UTC epoch ns, or None before any samples."""
+        if self._latest_ns is None:
+            return None
+        return self._latest_ns - self.lateness_ns
+
+    def push(self, sample):
+        """Add one `WattSample`, returning the periods it reported."""
+        return self.push_many([sample])
+
+    def push_many(self, samples):
+        """Add a batch of samples, in any order, returning reported periods.
+
+        The batch can be a list of `WattSample` objects or a
+        `WattSampleArray`. Each period is reported at most once per batch.
+        """
+        samples = WattSampleArray.from_samples(samples)
+        if len(samples) == 0:
+            return []
+        samples = samples.localize(self.period_class.time_zone())
+        ordinals = self.period_class.ordinals(samples.epoch_ns)
+
+        changed = set()
+        for epoch_ns, watts, ordinal in zip(samples.epoch_ns.tolist(),
+                                            samples.watts.tolist(),
+                                            ordinals.tolist()):
+            if self._final is not None and ordinal < self._final:
+                self.dropped += 1
+                continue
+            self._insert(ordinal, epoch_ns, watts)
+            changed.add(ordinal)
+        if not changed:
+            return []
+
+        newest = self.period_class.ordinals(self._latest_ns)
+        reports = [self._report(ordinal)
+                   for ordinal in range(min(self._periods), newest)
+                   if ordinal in changed or ordinal not in self._revisions]
+        self._finalise()
+        return reports
+
+    def flush(self):
+        """Report the newest period, and forget every period."""
+        if self._latest_ns is None:
+            return []
+        reports = [self._report(self.period_class.ordinals(self._latest_ns))]
+        self._periods.clear()
+        self._revisions.clear()
+        self._latest_ns = None
+        self._final = None
+        return reports
+
+    def _insert(self, ordinal, epoch_ns, watts):
+        """Add a sample to its period, after any at the same time."""
+        times, powers = self._periods.setdefault(ordinal, ([], []))
+        index = bisect_right(times, epoch_ns)
+        times.insert(index, epoch_ns)
+        powers.insert(index, watts)
+
+        if self._latest_ns is None or epoch_ns > self._latest_ns:
+            self._latest_ns = epoch_ns
+
+    def _report(self, ordinal):
+        """Integrate a period, with the next revision number."""
+        revision = self._revisions.get(ordinal, -1) + 1
+        self._revisions[ordinal] = revision
+
+        kwh = nan
+        if ordinal in self._periods:
+            times, powers = self._periods[ordinal]
+            kwh = integrate_by_period(
+                times, powers, period_ns=self.period_class.freq_ns(),
+                offset_ns=self.period_class.utc_offset_ns()).kwh[0]
+        return EnergyRevision(
+            energy=_period_energy(self.period_class, ordinal, kwh),
+            revision=revision)
+
+    def _finalise(self):
+        """Forget the periods that ended before the watermark."""
+        final = self.period_class.ordinals(self.watermark)
+        if self._final is not None and final <= self._final:
+            return
+        self._final = final
+        for periods in (self._periods, self._revisions):
+            for ordinal in [key for key in periods if key < final]:
+                del periods[ordinal]
+
+
+def _period_energy(period_class, ordinal, kwh):
+    """The energy object for a whole period."""
+    start = period_class.ordinal_start(ordinal)
+    end = period_class.ordinal_start(ordinal + 1)
+    return ElectricalEnergy(kwh=kwh, start=start, end=end)
+
+
+def _kwh(watts_1, watts_2, elapsed_ns):
+    """The energy between 2 samples, computed as in `interval_kwh`."""
+    mean_watts = (watts_1 + watts_2) / 2
+    return (mean_watts / 1000) * ((elapsed_ns / NS_PER_SECOND) / 3600)
+
+
+def _sequential_sum(values, initial=0.0):
+    """Add values one at a time, in order, as `by_period` does."""
+    if len(values) == 0:
+        return initial
+    return float(np.cumsum(np.append(initial, values))[-1])
+
+
+class OutOfOrderSample(ValueError):
+    """A sample arrived earlier than one already aggregated."""
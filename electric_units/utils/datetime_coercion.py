@@ -1,10 +1,161 @@
 """Convert from a string to a datetime."""
 
-from dateutil.parser import parse
+from datetime import datetime, timedelta
+import re
+from time import perf_counter
+import warnings
+
+from electric_units.utils import instrumentation
+from electric_units.utils.epoch import moments_to_epoch_ns
+from electric_units.utils.lazy_import import LazyModule
+from electric_units.utils.lru_cache import LRUCache
+
+# dateutil is only imported for strings that are not ISO-8601, and NumPy
+# for columns of moments.
+dateutil_parser = LazyModule('dateutil.parser')  # pylint: disable=invalid-name
+np = LazyModule('numpy')  # pylint: disable=invalid-name
+
+# Optional cache of parsed strings, see `enable_parse_cache`.
+_PARSE_CACHE = None
+
+# A trailing ISO-8601 UTC offset, such as Z, +10:00 or -0930.
+_ISO_OFFSET = re.compile(r'(Z|[+-]\d{2}:?\d{2})$')
 
 
 def datetime_coercion(moment):
     """Force the return of a datetime object."""
     if isinstance(moment, str):
-        return parse(moment)
+        return parse_datetime(moment)
     return moment
+
+
+def parse_datetime(text):
+    """Parse a string to a datetime.
+
+    A strict ISO-8601 parse is tried first, and dateutil is only used
+    for strings it cannot read. Results are cached when the parse cache
+    is enabled.
+    """
+    recorder = instrumentation.ACTIVE
+    started = perf_counter() if recorder is not None else None
+
+    if _PARSE_CACHE is not None:
+        moment = _PARSE_CACHE.get(text)
+        if moment is not None:
+            if recorder is not None:
+                recorder.record('parse.cached', started)
+            return moment
+
+    stage = 'parse.iso'
+    try:
+        moment = datetime.fromisoformat(text)
+    except ValueError:
+        stage = 'parse.dateutil'
+        moment = dateutil_parser.parse(text)
+
+    if _PARSE_CACHE is not None:
+        _PARSE_CACHE.put(text, moment)
+    if recorder is not None:
+        recorder.record(stage, started)
+    return moment
+
+
+def enable_parse_cache(maxsize=4096):
+    """Cache up to `maxsize` parsed strings, for feeds that repeat them."""
+    global _PARSE_CACHE  # pylint: disable=global-statement
+    _PARSE_CACHE = LRUCache(maxsize=maxsize)
+
+
+def disable_parse_cache():
+    """Stop caching parsed strings."""
+    global _PARSE_CACHE  # pylint: disable=global-statement
+    _PARSE_CACHE = None
+
+
+def parse_cache_info():
+    """Hits, misses, maxsize and size of the parse cache, or None."""
+    if _PARSE_CACHE is None:
+        return None
+    return _PARSE_CACHE.info()
+
+
+def coerce_many(moments):
+    """Convert a column of moments to nanoseconds since the epoch.
+
+    The moments can be strings, datetimes, a datetime64 array, or a pandas
+    datetime column. The format of strings is inferred from the first one,
+    and a column of ISO-8601 strings is converted in a single NumPy pass.
+
+    Returns:
+        A tuple of an int64 array of epoch ns, and the timezone of the
+        moments. Epoch ns are UTC when there is a timezone, otherwise they
+        count the naive wall clock.
+    """
+    if hasattr(moments, 'array') and hasattr(moments.array, 'asi8'):
+        return _pandas_epoch_ns(moments.array)
+
+    values = np.asarray(moments)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype('datetime64[ns]', copy=False).view(np.int64), None
+    if values.size == 0:
+        return np.array([], dtype=np.int64), None
+
+    if isinstance(values[0], str):
+        converted = _iso_epoch_ns(values)
+        if converted is not None:
+            return converted
+        values = [parse_datetime(value) for value in values]
+
+    return _datetime_epoch_ns(list(values))
+
+
+def _pandas_epoch_ns(array):
+    """View a pandas datetime array as epoch ns, without copying."""
+    dtype = array.dtype
+    unit = getattr(dtype, 'unit', None) or np.datetime_data(dtype)[0]
+    epoch = np.asarray(array.asi8).view(f'datetime64[{unit}]')
+    epoch_ns = epoch.astype('datetime64[ns]', copy=False).view(np.int64)
+    return epoch_ns, getattr(dtype, 'tz', None)
+
+
+def _iso_epoch_ns(values):
+    """Convert ISO-8601 strings that share the first string's UTC offset.
+
+    Returns None when the strings can't be converted in one pass.
+    """
+    try:
+        first = datetime.fromisoformat(values[0])
+    except ValueError:
+        return None
+
+    offset_ns = 0
+    if first.tzinfo is not None:
+        suffix = _ISO_OFFSET.search(values[0])
+        if suffix is None:
+            return None
+        suffix = suffix.group()
+        if not all(value.endswith(suffix) for value in values):
+            return None
+        values = [value[:-len(suffix)] for value in values]
+        offset_ns = first.utcoffset() // timedelta(microseconds=1) * 1000
+
+    # NumPy would silently shift any other offsets to UTC, refuse them.
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        try:
+            epoch = np.asarray(values, dtype='datetime64[ns]')
+        except (ValueError, Warning):
+            return None
+    # NumPy reads '', 'NaT' and 'nat' as NaT, which datetime_coercion
+    # refuses, so leave missing values to the slow path to raise.
+    if np.isnat(epoch).any():
+        return None
+    return epoch.view(np.int64) - offset_ns, first.tzinfo
+
+
+def _datetime_epoch_ns(moments):
+    """Convert datetimes, which must all be naive or all aware."""
+    zones = {moment.tzinfo is None for moment in moments}
+    if len(zones) > 1:
+        raise TypeError("can't mix offset-naive and offset-aware datetimes")
+    return moments_to_epoch_ns(moments), moments[0].tzinfo
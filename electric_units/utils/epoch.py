@@ -0,0 +1,71 @@
+"""Convert between datetimes and integer nanoseconds since the epoch."""
+
+from datetime import datetime, timedelta, timezone
+
+from electric_units.utils.lazy_import import LazyModule
+
+# NumPy is only imported by the functions on many moments.
+np = LazyModule('numpy')  # pylint: disable=invalid-name
+
+NS_PER_MICROSECOND = 1000
+NS_PER_SECOND = 1000 * 1000 * 1000
+NS_PER_MINUTE = 60 * NS_PER_SECOND
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def to_epoch_ns(moment):
+    """Nanoseconds since the epoch, as an integer.
+
+    Timezone aware moments are measured from the UTC epoch. Naive moments
+    are measured on their own wall clock, as though they were UTC.
+    """
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    delta = moment - EPOCH
+    seconds = (delta.days * 86400) + delta.seconds
+    return (seconds * NS_PER_SECOND) + (delta.microseconds * NS_PER_MICROSECOND)
+
+
+def from_epoch_ns(epoch_ns, time_zone=None):
+    """The datetime for a count of nanoseconds since the epoch.
+
+    The inverse of `to_epoch_ns`: a naive datetime is returned when no
+    timezone is given, otherwise the moment in that timezone.
+    """
+    moment = EPOCH + timedelta(microseconds=int(epoch_ns) // NS_PER_MICROSECOND)
+    if time_zone is None:
+        return moment
+    return moment.replace(tzinfo=timezone.utc).astimezone(time_zone)
+
+
+def moments_to_epoch_ns(moments):
+    """An int64 array of nanoseconds since the epoch for many datetimes."""
+    return np.fromiter((to_epoch_ns(moment) for moment in moments),
+                       dtype=np.int64, count=len(moments))
+
+
+def duration_ns(duration):
+    """The length of a timedelta, in integer nanoseconds."""
+    return duration // timedelta(microseconds=1) * NS_PER_MICROSECOND
+
+
+def fixed_offset_ns(time_zone):
+    """The UTC offset of a timezone, in nanoseconds.
+
+    Returns None when the timezone has no single fixed offset, for example
+    when it observes daylight savings.
+    """
+    offset = time_zone.utcoffset(None)
+    if offset is None:
+        return None
+    return duration_ns(offset)
+
+
+def localize_epoch_ns(epoch_ns, time_zone):
+    """Convert naive wall clock epoch ns in a timezone to UTC epoch ns."""
+    offset = fixed_offset_ns(time_zone)
+    if offset is not None:
+        return epoch_ns - offset
+    return moments_to_epoch_ns([
+        time_zone.localize(from_epoch_ns(moment)) for moment in epoch_ns])
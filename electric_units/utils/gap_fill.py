@@ -0,0 +1,62 @@
+"""Fill the energy of empty periods between periods with samples."""
+
+import numpy as np
+
+FILL_METHODS = ('nan', 'zero', 'linear', 'carry')
+
+
+def fill_gaps(ordinals, kwh, method='nan', segment_starts=None):
+    """Add a row for each empty period between sorted periods.
+
+    The empty periods are found from the gaps in the ordinals, in one pass.
+    Their energy is filled with:
+
+    - 'nan': NaN, the energy is unknown.
+    - 'zero': 0 kWh.
+    - 'linear': interpolated between the periods either side.
+    - 'carry': the energy of the period before.
+
+    Args:
+        ordinals: Sorted int64 ordinals of the periods with samples.
+        kwh: The energy in each of those periods.
+        method: How to fill empty periods, one of `FILL_METHODS`.
+        segment_starts: Optional bool array, True where a period starts a
+            new, independent, series. No gaps are filled across them.
+
+    Returns the ordinal and energy of every row, and the number of rows
+    each input period now spans: itself, and the empty periods after it.
+    """
+    if method not in FILL_METHODS:
+        raise ValueError(f"fill must be one of {', '.join(FILL_METHODS)}")
+    ordinals = np.asarray(ordinals, dtype=np.int64)
+    kwh = np.asarray(kwh, dtype=np.float64)
+
+    gaps = np.zeros(len(ordinals), dtype=np.int64)
+    gaps[:-1] = np.diff(ordinals) - 1
+    if segment_starts is not None:
+        gaps[:-1][segment_starts[1:]] = 0
+    rows = gaps + 1
+    positions = np.cumsum(rows) - rows
+
+    size = int(rows.sum())
+    before = np.repeat(np.arange(len(ordinals)), rows)
+    row_ordinals = ordinals[before] + (np.arange(size) - positions[before])
+    row_kwh = _filled(method, ordinals, kwh, before, row_ordinals)
+    row_kwh[positions] = kwh
+    return row_ordinals, row_kwh, rows
+
+
+def _filled(method, ordinals, kwh, before, row_ordinals):
+    """The fill energy of each row, given the period before each row."""
+    if method == 'nan':
+        return np.full(len(row_ordinals), np.nan)
+    if method == 'zero':
+        return np.zeros(len(row_ordinals))
+    if method == 'carry':
+        return kwh[before]
+
+    # Rows after the last period are overwritten by it, so clip the index.
+    after = np.minimum(before + 1, len(ordinals) - 1)
+    span = np.maximum(ordinals[after] - ordinals[before], 1)
+    fraction = (row_ordinals - ordinals[before]) / span
+    return kwh[before] + ((kwh[after] - kwh[before]) * fraction)
@@ -0,0 +1,112 @@
+"""Opt-in counts and timings of the hot paths, for finding slow stages.
+
+Instrumentation is off by default, when each hot path only checks that
+`ACTIVE` is None. Turn it on for a block of code with `instrumented`:
+
+    with instrumented() as recorder:
+        energy.by_period(NemSettlementPeriod)
+    recorder.report()
+
+or for the whole process with `enable_instrumentation`.
+"""
+
+from contextlib import contextmanager, nullcontext
+from threading import Lock
+from time import perf_counter
+
+# The recorder in use, or None when instrumentation is off.
+ACTIVE = None
+
+_UNTIMED = nullcontext()
+
+
+class Recorder:
+    """Counts, and cumulative seconds, of each instrumented stage."""
+
+    def __init__(self):
+        """Start with no stages recorded."""
+        self._stages = {}
+        self._lock = Lock()
+
+    def record(self, stage, started):
+        """Count one run of a stage, which started at `perf_counter` time."""
+        seconds = perf_counter() - started
+        with self._lock:
+            count, total = self._stages.get(stage, (0, 0.0))
+            self._stages[stage] = (count + 1, total + seconds)
+
+    def report(self):
+        """The count and total seconds of each stage, keyed by stage."""
+        with self._lock:
+            return {stage: {'count': count, 'seconds': seconds}
+                    for stage, (count, seconds) in sorted(self._stages.items())}
+
+    def metrics(self, prefix='electric_units'):
+        """The report as flat metric names and values."""
+        metrics = {}
+        for stage, values in self.report().items():
+            for field, value in values.items():
+                metrics[f"{prefix}.{stage}.{field}"] = value
+        return metrics
+
+    def reset(self):
+        """Forget every stage."""
+        with self._lock:
+            self._stages.clear()
+
+
+class _Timing:
+    """Time a block as one run of a stage."""
+
+    def __init__(self, recorder, stage):
+        """Hold the recorder and stage until the block starts."""
+        self.recorder = recorder
+        self.stage = stage
+        self.started = None
+
+    def __enter__(self):
+        """Start timing."""
+        self.started = perf_counter()
+
+    def __exit__(self, *exc_info):
+        """Record the stage."""
+        self.recorder.record(self.stage, self.started)
+
+
+def timed(stage):
+    """A context manager that times a block as one run of a stage.
+
+    For stages that run once per call, rather than once per object, where
+    the cost of entering an empty context when disabled is negligible.
+    """
+    recorder = ACTIVE
+    if recorder is None:
+        return _UNTIMED
+    return _Timing(recorder, stage)
+
+
+def enable_instrumentation():
+    """Record the hot paths from now on, returning the recorder."""
+    global ACTIVE  # pylint: disable=global-statement
+    ACTIVE = Recorder()
+    return ACTIVE
+
+
+def disable_instrumentation():
+    """Stop recording the hot paths."""
+    global ACTIVE  # pylint: disable=global-statement
+    ACTIVE = None
+
+
+@contextmanager
+def instrumented():
+    """Record the hot paths within a block, yielding the recorder.
+
+    The instrumentation in use before the block is restored after it.
+    """
+    global ACTIVE  # pylint: disable=global-statement
+    previous, ACTIVE = ACTIVE, Recorder()
+    try:
+        yield ACTIVE
+    finally:
+        ACTIVE = previous
@@ -0,0 +1,179 @@
+"""Integrate power samples into energy."""
+
+from attr import attrs, attrib
+import numpy as np
+
+from electric_units.utils.epoch import NS_PER_SECOND
+
+# How the power between 2 samples is found: interpolated, or held from
+# the earlier or the later sample.
+RULES = ('trapezoid', 'previous', 'next')
+
+
+def interval_kwh(epoch_ns, watts, rule='trapezoid'):
+    """The energy, in kWh, between each consecutive pair of samples.
+
+    By default the power drawn between 2 samples is the mean of those 2
+    samples, and is weighted by the full duration between them.
+
+    Args:
+        epoch_ns: Sorted int64 sample times, in nanoseconds.
+        watts: float64 power samples, in watts.
+        rule: 'trapezoid', or 'previous' or 'next' to hold the earlier or
+            later sample's power across the interval.
+    """
+    epoch_ns = np.asarray(epoch_ns, dtype=np.int64)
+    watts = np.asarray(watts, dtype=np.float64)
+
+    held_watts = _held_watts(watts[:-1], watts[1:], rule)
+    seconds = np.diff(epoch_ns) / NS_PER_SECOND
+    return (held_watts / 1000) * (seconds / 3600)
+
+
+def cumulative_kwh_at(epoch_ns, watts, cumulative_kwh, at_ns,
+                      rule='trapezoid'):
+    """The energy from the first sample to each of many moments.
+
+    Moments between samples add the part of their interval before them,
+    with the power interpolated for the trapezoidal rule.
+
+    Args:
+        epoch_ns: Sorted int64 sample times, in nanoseconds.
+        watts: float64 power samples, in watts.
+        cumulative_kwh: The energy from the first sample to each sample,
+            integrated with the same rule.
+        at_ns: int64 moments, within the samples' times.
+        rule: One of `RULES`.
+    """
+    before = np.clip(np.searchsorted(epoch_ns, at_ns, side='right') - 1,
+                     0, len(epoch_ns) - 2)
+    elapsed_ns = at_ns - epoch_ns[before]
+
+    earlier, later = watts[before], watts[before + 1]
+    if rule == 'trapezoid':
+        interval_ns = epoch_ns[before + 1] - epoch_ns[before]
+        fraction = np.divide(elapsed_ns, interval_ns,
+                             out=np.zeros(len(elapsed_ns)),
+                             where=interval_ns > 0)
+        later = earlier + (later - earlier) * fraction
+
+    partial_kwh = (_held_watts(earlier, later, rule) / 1000) * \
+        (elapsed_ns / NS_PER_SECOND / 3600)
+    return cumulative_kwh[before] + partial_kwh
+
+
+def _held_watts(earlier, later, rule):
+    """The power held between samples of `earlier` and `later` watts."""
+    if rule == 'trapezoid':
+        return (earlier + later) / 2
+    if rule == 'previous':
+        return earlier
+    if rule == 'next':
+        return later
+    raise ValueError(f"rule must be one of {', '.join(RULES)}")
+
+
+def trapezoid_kwh(epoch_ns, watts):
+    """The total energy, in kWh, of a sorted series of power samples."""
+    return float(interval_kwh(epoch_ns, watts).sum())
+
+
+@attrs(frozen=True)
+class PeriodIntegrals:
+    """The energy in each period of a series of samples.
+
+    Args:
+        ordinals: The ordinal of each period that holds samples.
+        first: The index, in the input samples, of each period's first.
+        offsets: Period `i` covers `epoch_ns[offsets[i]:offsets[i + 1]]`.
+        epoch_ns: The samples' times, with the extrapolated period edges.
+        watts: The samples' power, with the extrapolated period edges.
+        kwh: The energy in each period.
+    """
+
+    ordinals = attrib()
+    first = attrib()
+    offsets = attrib()
+    epoch_ns = attrib()
+    watts = attrib()
+    kwh = attrib()
+
+
+def integrate_by_period(epoch_ns, watts, period_ns, offset_ns=0,
+                        segment_starts=None):
+    """Integrate sorted samples separately within each period.
+
+    Inside a period the power is interpolated between its samples. The
+    first sample's power is held back to the start of the period, and the
+    last sample's power forward to its end. The extrapolated samples are
+    inserted in bulk, so no per sample objects are created.
+
+    Args:
+        epoch_ns: Sorted int64 UTC sample times, in nanoseconds.
+        watts: float64 power samples, in watts.
+        period_ns: The period duration, in nanoseconds.
+        offset_ns: The offset of the period clock from UTC.
+        segment_starts: Optional bool array, True where a sample starts a
+            new, independent, series (for example a new meter).
+    """
+    epoch_ns = np.asarray(epoch_ns, dtype=np.int64)
+    watts = np.asarray(watts, dtype=np.float64)
+    sample_ordinals = (epoch_ns + offset_ns) // period_ns
+
+    first = _group_starts(sample_ordinals, segment_starts)
+    ordinals = sample_ordinals[first]
+    start_ns = (ordinals * period_ns) - offset_ns
+
+    out_ns, out_watts, offsets = _with_period_edges(
+        epoch_ns, watts, first, start_ns, start_ns + period_ns)
+
+    # Intervals that bridge two periods are not part of either.
+    interval_groups = np.repeat(np.arange(len(first)), np.diff(offsets))[:-1]
+    within = np.ones(max(len(out_ns) - 1, 0), dtype=bool)
+    within[offsets[1:-1] - 1] = False
+    kwh = np.bincount(interval_groups[within],
+                      weights=interval_kwh(out_ns, out_watts)[within],
+                      minlength=len(first)).astype(np.float64)
+
+    return PeriodIntegrals(ordinals=ordinals, first=first, offsets=offsets,
+                           epoch_ns=out_ns, watts=out_watts, kwh=kwh)
+
+
+def _group_starts(ordinals, segment_starts=None):
+    """The index of the first sample in each run of equal ordinals."""
+    new_group = np.empty(len(ordinals), dtype=bool)
+    new_group[:1] = True
+    np.not_equal(ordinals[1:], ordinals[:-1], out=new_group[1:])
+    if segment_starts is not None:
+        new_group |= segment_starts
+    return np.flatnonzero(new_group)
+
+
+def _with_period_edges(epoch_ns, watts, first, start_ns, end_ns):
+    """Insert the extrapolated edge samples of each group of samples.
+
+    Returns the new times and power, and the offset of each group in them.
+    """
+    last = np.append(first[1:], len(epoch_ns))[:len(first)] - 1
+    needs_start = epoch_ns[first] > start_ns
+    # Each group shifts right by the edges inserted before it.
+    shift = np.cumsum(needs_start) + np.arange(len(first))
+
+    size = len(epoch_ns) + int(needs_start.sum()) + len(first)
+    out_ns = np.empty(size, dtype=np.int64)
+    out_watts = np.empty(size, dtype=np.float64)
+
+    sample_pos = np.arange(len(epoch_ns)) + np.repeat(shift, last - first + 1)
+    out_ns[sample_pos] = epoch_ns
+    out_watts[sample_pos] = watts
+
+    start_pos = (first + shift - 1)[needs_start]
+    out_ns[start_pos] = start_ns[needs_start]
+    out_watts[start_pos] = watts[first[needs_start]]
+
+    end_pos = last + shift + 1
+    out_ns[end_pos] = end_ns
+    out_watts[end_pos] = watts[last]
+
+    offsets = np.append(first + shift - needs_start, size)
+    return out_ns, out_watts, offsets
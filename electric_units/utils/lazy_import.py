@@ -0,0 +1,28 @@
+"""Defer importing a module until one of its attributes is first used."""
+
+from importlib import import_module
+
+
+class LazyModule:
+    """A stand in for a module, which imports it on first attribute access.
+
+    Each attribute is copied onto the stand in as it is read, so later
+    reads are ordinary attribute lookups.
+
+    Args:
+        name: The full name of the module, e.g. 'dateutil.parser'.
+    """
+
+    def __init__(self, name):
+        """Hold the module name until it is needed."""
+        self.__dict__['_name'] = name
+
+    def __getattr__(self, attribute):
+        """Import the module, then read and keep the attribute."""
+        value = getattr(import_module(self._name), attribute)
+        self.__dict__[attribute] = value
+        return value
+
+    def __repr__(self):
+        """Name the module, and whether it has been imported."""
+        return f"<lazy module {self._name!r}>"
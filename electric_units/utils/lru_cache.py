@@ -0,0 +1,64 @@
+"""A bounded cache, which drops the least recently used entries."""
+
+from collections import OrderedDict, namedtuple
+from threading import Lock
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class LRUCache:
+    """A least recently used cache, with hit and miss statistics.
+
+    Args:
+        maxsize: The most entries to hold. Zero disables the cache.
+    """
+
+    def __init__(self, maxsize=128):
+        """Create an empty cache."""
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        """The cached value for a key, marking it as recently used."""
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Cache a value, dropping the oldest entries if full."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._trim()
+
+    def resize(self, maxsize):
+        """Change the most entries the cache holds."""
+        with self._lock:
+            self.maxsize = maxsize
+            self._trim()
+
+    def clear(self):
+        """Empty the cache and reset its statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        """Hits, misses, maxsize and current size, as a named tuple."""
+        return CacheInfo(self.hits, self.misses, self.maxsize,
+                         len(self._entries))
+
+    def _trim(self):
+        """Drop the least recently used entries above the maxsize."""
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
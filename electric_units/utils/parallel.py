@@ -0,0 +1,125 @@
+"""Integrate large series of samples in chunks, in a pool of processes."""
+
+from contextlib import contextmanager
+from itertools import repeat
+import os
+import shutil
+from tempfile import TemporaryDirectory, gettempdir
+
+import numpy as np
+
+from electric_units.utils.integration import (
+    PeriodIntegrals, integrate_by_period)
+
+# RAM backed, where there is one, so the shared columns never reach disk.
+_SHARED_MEMORY = '/dev/shm'
+
+
+def integrate_in_chunks(  # pylint: disable=too-many-arguments
+        epoch_ns, watts, period_ns, offset_ns=0, *, executor, chunks=None):
+    """`integrate_by_period`, in chunks run by a pool of processes.
+
+    The samples are split at period boundaries. A period's energy, and its
+    edge samples, depend only on its own samples, so the chunks' integrals
+    join into those of the samples at once. The samples are written once
+    to files the workers memory map, rather than pickled, and the chunks'
+    integrals are only concatenated here.
+
+    Args:
+        epoch_ns: Sorted int64 UTC sample times, in nanoseconds.
+        watts: float64 power samples, in watts.
+        period_ns: The period duration, in nanoseconds.
+        offset_ns: The offset of the period clock from UTC.
+        executor: The caller's executor, such as a ProcessPoolExecutor,
+            which can be reused across calls.
+        chunks: The number of chunks, by default the number of CPUs.
+    """
+    epoch_ns = np.ascontiguousarray(epoch_ns, dtype=np.int64)
+    watts = np.ascontiguousarray(watts, dtype=np.float64)
+    bounds = _period_chunk_bounds(epoch_ns, period_ns, offset_ns,
+                                  chunks or os.cpu_count() or 1)
+    if len(bounds) < 2:
+        return integrate_by_period(epoch_ns, watts, period_ns, offset_ns)
+
+    with shared_columns(epoch_ns, watts) as columns:
+        lowers, uppers = zip(*bounds)
+        results = list(executor.map(
+            _integrate_mapped, repeat(columns), lowers, uppers,
+            repeat(period_ns), repeat(offset_ns)))
+    return _joined(results, lowers)
+
+
+@contextmanager
+def shared_columns(*columns):
+    """Write columns to temporary files, for workers to memory map.
+
+    Yields a `(filename, dtype)` pair per column, to pass to the workers
+    with each chunk's rows, and deletes the files on exit.
+    """
+    size = sum(column.nbytes for column in columns)
+    with TemporaryDirectory(dir=_shared_directory(size)) as directory:
+        described = []
+        for number, column in enumerate(columns):
+            filename = os.path.join(directory, str(number))
+            np.ascontiguousarray(column).tofile(filename)
+            described.append((filename, column.dtype.str))
+        yield tuple(described)
+
+
+def mapped_rows(columns, lower, upper):
+    """The rows from `lower` to `upper` of shared columns, in a worker."""
+    return tuple(np.memmap(filename, dtype=dtype, mode='r')[lower:upper]
+                 for filename, dtype in columns)
+
+
+def _integrate_mapped(columns, lower, upper, period_ns, offset_ns):
+    """Integrate a chunk of mapped samples, in a worker.
+
+    Returns the chunk's `PeriodIntegrals`, indexed within the chunk.
+    """
+    epoch_ns, watts = mapped_rows(columns, lower, upper)
+    return integrate_by_period(epoch_ns, watts, period_ns, offset_ns)
+
+
+def _joined(chunk_integrals, lowers):
+    """Join the integrals of consecutive chunks, starting at `lowers`."""
+    sizes = [len(integrals.epoch_ns) for integrals in chunk_integrals]
+    out_lowers = np.cumsum(sizes) - sizes
+    return PeriodIntegrals(
+        ordinals=np.concatenate([integrals.ordinals
+                                 for integrals in chunk_integrals]),
+        first=np.concatenate([integrals.first + lower for integrals, lower
+                              in zip(chunk_integrals, lowers)]),
+        offsets=np.concatenate(
+            [integrals.offsets[:-1] + out_lower for integrals, out_lower
+             in zip(chunk_integrals, out_lowers)] + [[sum(sizes)]]),
+        epoch_ns=np.concatenate([integrals.epoch_ns
+                                 for integrals in chunk_integrals]),
+        watts=np.concatenate([integrals.watts
+                              for integrals in chunk_integrals]),
+        kwh=np.concatenate([integrals.kwh for integrals in chunk_integrals]))
+
+
+def _shared_directory(size):
+    """A directory for `size` bytes of shared columns.
+
+    /dev/shm is used when it has room to spare, as containers often give it
+    only a little space, and otherwise the temporary directory.
+    """
+    if os.path.isdir(_SHARED_MEMORY) and \
+            shutil.disk_usage(_SHARED_MEMORY).free > 2 * size:
+        return _SHARED_MEMORY
+    return gettempdir()
+
+
+def _period_chunk_bounds(epoch_ns, period_ns, offset_ns, chunks):
+    """Split sorted samples into about equal chunks of whole periods."""
+    if len(epoch_ns) == 0:
+        return []
+    targets = np.linspace(0, len(epoch_ns), chunks + 1)[1:-1].astype(np.int64)
+    # Move each split back to the start of its period.
+    ordinals = (epoch_ns[targets] + offset_ns) // period_ns
+    splits = np.searchsorted(epoch_ns, ordinals * period_ns - offset_ns,
+                             side='left')
+    bounds = np.unique(np.concatenate(([0], splits, [len(epoch_ns)])))
+    return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
@@ -0,0 +1,147 @@
+"""Many measurements of power, stored as columns."""
+
+from attr import attrs, attrib
+import numpy as np
+
+from electric_units.utils.datetime_coercion import coerce_many
+from electric_units.utils.epoch import (
+    from_epoch_ns, localize_epoch_ns, moments_to_epoch_ns)
+from electric_units.watt_sample import WattSample
+
+
+def _epoch_ns_column(values):
+    """View datetime64 or integer values as int64 nanoseconds."""
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        values = values.astype('datetime64[ns]', copy=False).view(np.int64)
+    return np.asarray(values, dtype=np.int64)
+
+
+def _watts_column(values):
+    """View power values as float64 watts."""
+    return np.asarray(values, dtype=np.float64)
+
+
+@attrs(frozen=True, eq=False)
+class WattSampleArray:
+    """A series of power samples, stored as an array per field.
+
+    A compact alternative to a list of `WattSample` objects. The times are
+    an int64 column of nanoseconds since the epoch, and the power is a
+    float64 column of watts. Indexing the array returns `WattSample`
+    objects, so it can stand in for a list of them.
+
+    Args:
+        epoch_ns: Sample times in nanoseconds since the epoch, or datetime64
+            values. UTC when `time_zone` is set, otherwise naive wall clock.
+        watts: The power of each sample, in watts.
+        time_zone: The timezone the moments are reported in, or None for
+            naive moments.
+    """
+
+    epoch_ns = attrib(converter=_epoch_ns_column, repr=False)
+    watts = attrib(converter=_watts_column, repr=False)
+    time_zone = attrib(default=None)
+
+    def __attrs_post_init__(self):
+        """Post hook from attrs."""
+        if self.epoch_ns.ndim != 1 or self.epoch_ns.shape != self.watts.shape:
+            raise ValueError("epoch_ns and watts must be 1-D and equal length")
+
+    @classmethod
+    def from_samples(cls, samples):
+        """Create the array from a list of `WattSample` objects."""
+        if isinstance(samples, cls):
+            return samples
+
+        samples = list(samples)
+        if not samples:
+            return cls(epoch_ns=[], watts=[])
+
+        zones = {sample.moment.tzinfo is None for sample in samples}
+        if len(zones) > 1:
+            raise TypeError(
+                "can't mix offset-naive and offset-aware sample moments")
+
+        epoch_ns = moments_to_epoch_ns([sample.moment for sample in samples])
+        watts = np.fromiter((sample.watts for sample in samples),
+                            dtype=np.float64, count=len(samples))
+        return cls(epoch_ns=epoch_ns, watts=watts,
+                   time_zone=samples[0].moment.tzinfo)
+
+    @classmethod
+    def from_moments(cls, moments, watts):
+        """Create the array from a column of moments and a column of power.
+
+        The moments may be ISO-8601 strings, datetimes, datetime64 values or
+        a pandas datetime column, and are converted in bulk.
+        """
+        epoch_ns, time_zone = coerce_many(moments)
+        return cls(epoch_ns=epoch_ns, watts=np.asarray(watts),
+                   time_zone=time_zone)
+
+    @classmethod
+    def from_pandas(cls, moments, watts):
+        """Create the array from pandas columns, without copying them.
+
+        Args:
+            moments: A datetime Series or DatetimeIndex, naive or tz-aware.
+            watts: A Series, or array, of power in watts.
+        """
+        return cls.from_moments(moments, watts)
+
+    def __len__(self):
+        """The number of samples."""
+        return len(self.epoch_ns)
+
+    def __getitem__(self, item):
+        """A `WattSample`, or a new array viewing a slice of this one."""
+        if isinstance(item, slice):
+            return self.__class__(epoch_ns=self.epoch_ns[item],
+                                  watts=self.watts[item],
+                                  time_zone=self.time_zone)
+        return WattSample(watts=self.watts[item],
+                          moment=self.moment_at(item))
+
+    def __iter__(self):
+        """Iterate over the samples as `WattSample` objects."""
+        for index in range(len(self)):
+            yield self[index]
+
+    def moment_at(self, index):
+        """The datetime of a single sample."""
+        return from_epoch_ns(self.epoch_ns[index], self.time_zone)
+
+    def is_sorted(self):
+        """Are the samples in time order."""
+        return bool(np.all(self.epoch_ns[1:] >= self.epoch_ns[:-1]))
+
+    def sorted(self):
+        """The samples in time order, without copying if already sorted."""
+        if self.is_sorted():
+            return self
+        order = np.argsort(self.epoch_ns, kind='stable')
+        return self.__class__(epoch_ns=self.epoch_ns[order],
+                              watts=self.watts[order],
+                              time_zone=self.time_zone)
+
+    def localize(self, time_zone):
+        """The same samples, reported in another timezone.
+
+        Naive moments are assumed to already be in that timezone.
+        """
+        epoch_ns = self.epoch_ns
+        if self.time_zone is None:
+            epoch_ns = localize_epoch_ns(epoch_ns, time_zone)
+        return self.__class__(epoch_ns=epoch_ns, watts=self.watts,
+                              time_zone=time_zone)
+
+    def settlement_period(self, period_class):
+        """The period which each sample was taken within."""
+        return [period_class.from_ordinal(ordinal)
+                for ordinal in self.period_ordinals(period_class)]
+
+    def period_ordinals(self, period_class):
+        """The ordinal of the period each sample was taken within."""
+        samples = self.localize(period_class.time_zone())
+        return period_class.ordinals(samples.epoch_ns)
@@ -18,7 +18,8 @@ setup(
     author_email='administrator@ample.tech',
     zip_safe=False,
     license='MIT',
-    packages=find_packages(exclude=['tests', 'tests.*']),
+    packages=find_packages(
+        exclude=['tests', 'tests.*', 'benchmarks', 'benchmarks.*']),
     include_package_data=True,
     keywords=['energy', 'grid', 'data', 'data transformation'],
     classifiers=[
@@ -36,6 +37,5 @@ setup(
         'pandas>0.25',
         'python-dateutil',
         'pytz',
-        'requests',
     ]
 )
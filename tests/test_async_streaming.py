@@ -0,0 +1,94 @@
+"""Test aggregating many meters' async streams of samples."""
+import asyncio
+
+import pytest
+
+from electric_units import NemDispatchPeriod, WattSample
+from electric_units.async_streaming import fan_in_by_period
+from electric_units.streaming import stream_by_period
+
+
+def _samples(watts, count):
+    """A sample every 2 minutes."""
+    return [WattSample(watts=watts,
+                       moment=f'2019-11-01T12:{minute:02}:00+10:00')
+            for minute in range(0, 2 * count, 2)]
+
+
+async def _stream(samples):
+    """Yield samples, letting other streams run between them."""
+    for sample in samples:
+        await asyncio.sleep(0)
+        yield sample
+
+
+async def _fan_in(streams, **kwargs):
+    """Run the fan in, collecting its results."""
+    results = asyncio.Queue(maxsize=5)
+    collected = []
+
+    async def collect():
+        while True:
+            collected.append(await results.get())
+
+    collector = asyncio.ensure_future(collect())
+    await fan_in_by_period(streams, NemDispatchPeriod, results, **kwargs)
+    while not results.empty():
+        await asyncio.sleep(0)
+    collector.cancel()
+    return collected
+
+
+def test_fan_in_matches_stream_by_period():
+    """Each meter's periods match integrating its stream alone."""
+    samples = {'a': _samples(1000, 12), 'b': _samples(3000, 7)}
+    streams = {meter_id: _stream(meter_samples)
+               for meter_id, meter_samples in samples.items()}
+    collected = asyncio.run(_fan_in(streams, batch_size=4, max_pending=3))
+
+    for meter_id, meter_samples in samples.items():
+        expected = list(stream_by_period(meter_samples, NemDispatchPeriod))
+        assert [result.energy for result in collected
+                if result.meter_id == meter_id] == expected
+
+
+def test_stream_error_stops_the_others():
+    """A failing stream is raised at once, without waiting on a slow one."""
+    async def failing():
+        for sample in _samples(1000, 3):
+            yield sample
+        raise ConnectionError
+
+    async def slow():
+        for sample in _samples(2000, 3):
+            await asyncio.sleep(3600)
+            yield sample
+
+    async def run():
+        with pytest.raises(ConnectionError):
+            await asyncio.wait_for(fan_in_by_period(
+                {'a': failing(), 'b': slow()}, NemDispatchPeriod,
+                asyncio.Queue()), timeout=5)
+
+    asyncio.run(run())
+
+
+def test_cancel_with_a_full_intake():
+    """Cancelling doesn't wait on readers blocked by full queues."""
+    async def run():
+        results = asyncio.Queue(maxsize=1)
+        fan_in = asyncio.ensure_future(fan_in_by_period(
+            {'a': _stream(_samples(1000, 30))}, NemDispatchPeriod, results,
+            batch_size=1, max_pending=1))
+        # Nothing takes the results, so every queue fills.
+        while not results.full():
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.01)
+        fan_in.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(fan_in, timeout=5)
+        # No reader is left waiting to put its end on the intake.
+        others = asyncio.all_tasks() - {asyncio.current_task()}
+        await asyncio.wait_for(asyncio.gather(*others), timeout=1)
+
+    asyncio.run(run())
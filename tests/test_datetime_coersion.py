@@ -1,8 +1,13 @@
 """Test the datetime coercion."""
 
-from datetime import datetime
+from datetime import datetime, timedelta
 from pytz import timezone
-from electric_units.utils.datetime_coercion import datetime_coercion
+import pytest
+
+from electric_units.utils.datetime_coercion import (
+    coerce_many, datetime_coercion, disable_parse_cache, enable_parse_cache,
+    parse_cache_info)
+from electric_units.utils.epoch import to_epoch_ns
 
 
 def test_datetime():
@@ -25,3 +30,52 @@ def test_string_input():
     aest_moment = aest.localize(datetime(2020, 2, 25, 12, 0, 0))
     aest_moment_as_string = aest_moment.isoformat()
     assert aest_moment == datetime_coercion(aest_moment_as_string)
+
+
+def test_parse_cache():
+    """Repeated strings are served from the optional cache."""
+    enable_parse_cache(maxsize=2)
+    try:
+        first = datetime_coercion('2020-02-25T12:15:00')
+        assert datetime_coercion('2020-02-25T12:15:00') is first
+        assert parse_cache_info().hits == 1
+    finally:
+        disable_parse_cache()
+    assert parse_cache_info() is None
+
+
+def test_non_iso_string():
+    """Strings that are not ISO-8601 are still understood."""
+    assert datetime_coercion('25 Feb 2020 12:15') == datetime(
+        2020, 2, 25, 12, 15, 0)
+
+
+def test_coerce_many():
+    """A column of strings converts to epoch nanoseconds in bulk."""
+    epoch_ns, time_zone = coerce_many(
+        ['2020-02-25T12:15:00', '2020-02-25T12:45:00'])
+    assert time_zone is None
+    assert list(epoch_ns) == [to_epoch_ns(datetime(2020, 2, 25, 12, 15)),
+                              to_epoch_ns(datetime(2020, 2, 25, 12, 45))]
+
+    epoch_ns, time_zone = coerce_many(
+        ['2020-02-25T12:15:00+10:00', '2020-02-25T12:45:00+10:00'])
+    assert time_zone.utcoffset(None) == timedelta(hours=10)
+    assert epoch_ns[0] == to_epoch_ns(datetime(2020, 2, 25, 2, 15))
+
+
+def test_coerce_many_mixed_offsets():
+    """Columns the fast path can't read are converted one at a time."""
+    epoch_ns, _ = coerce_many(
+        ['2020-02-25T12:15:00+10:00', '2020-02-25T02:15:00Z', '25 Feb 2020 2:15Z'])
+    assert len(set(epoch_ns)) == 1
+
+    with pytest.raises(TypeError):
+        coerce_many(['2020-02-25T12:15:00', '2020-02-25T12:15:00+10:00'])
+
+
+@pytest.mark.parametrize('missing', ['', 'NaT', 'nat'])
+def test_coerce_many_missing(missing):
+    """Strings NumPy reads as NaT are refused, as datetime_coercion does."""
+    with pytest.raises(ValueError):
+        coerce_many(['2020-02-25T12:15:00', missing])
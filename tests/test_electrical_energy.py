@@ -1,10 +1,14 @@
 """Test the ElectricalEnergy object."""
+from concurrent.futures import ProcessPoolExecutor
 from math import isnan
 from datetime import datetime
+import numpy as np
 from pytz import timezone
 import pytest
 
-from electric_units import ElectricalEnergy, NemSettlementPeriod, WattSample
+from electric_units import (
+    ElectricalEnergy, NemDispatchPeriod, NemSettlementPeriod, WattSample,
+    WattSampleArray)
 from electric_units.electrical_energy import (
     _extrapolate_constant, _average_kwh, TooFewSamples)
 
@@ -236,3 +240,84 @@ def test_add_nan_to_energy_groups():
     assert isnan(energy_periods[2].kwh)
     assert energy_periods[2].start == nan_period_start_2
     assert energy_periods[2].end == nan_period_end_2
+
+
+@pytest.mark.parametrize('fill, expected', [
+    ('zero', [0.0, 0.0]),
+    ('carry', [2.5, 2.5]),
+    ('linear', [2.5 + (0.5 / 3), 2.5 + (1 / 3)]),
+])
+def test_by_period_fill(fill, expected):
+    """Empty periods can be filled with zero, carried or interpolated."""
+    samples = [
+        WattSample(watts=5000, moment='2019-11-01T13:00:00'),
+        WattSample(watts=5000, moment='2019-11-01T13:15:00'),
+        WattSample(watts=6000, moment='2019-11-01T14:30:00'),
+        WattSample(watts=6000, moment='2019-11-01T14:45:00')
+    ]
+
+    energy = ElectricalEnergy.from_power_samples(samples)
+    energy_periods = energy.by_period(NemSettlementPeriod, fill=fill)
+
+    assert [period.kwh for period in energy_periods] == pytest.approx(
+        [2.5] + expected + [3.0])
+    assert energy_periods[1].start == NemSettlementPeriod(
+        '2019-11-01T13:30:00').start
+    assert energy_periods[2].samples is None
+
+    with pytest.raises(ValueError):
+        energy.by_period(NemSettlementPeriod, fill='mean')
+
+
+def test_by_period_from_sample_array():
+    """Columnar samples aggregate to the same periods as a list."""
+    samples = [
+        WattSample(watts=10000, moment='2019-11-01T13:00:00'),
+        WattSample(watts=20000, moment='2019-11-01T13:07:30'),
+        WattSample(watts=10000, moment='2019-11-01T13:12:00'),
+        WattSample(watts=30000, moment='2019-11-01T13:20:00'),
+    ]
+    array = WattSampleArray.from_samples(samples[::-1])
+    ordinals = array.period_ordinals(NemDispatchPeriod)
+    assert list(ordinals - ordinals[-1]) == [4, 2, 1, 0]
+
+    from_list = ElectricalEnergy.from_power_samples(samples)
+    from_array = ElectricalEnergy.from_power_samples(array)
+    periods = from_array.by_period(NemDispatchPeriod)
+
+    expected = from_list.by_period(NemDispatchPeriod)
+    assert periods[:3] + periods[4:] == expected[:3] + expected[4:]
+    assert [len(period.samples) for period in periods if period.samples
+            is not None] == [2, 3, 3, 2]
+    assert isnan(periods[3].kwh)
+    assert periods[1].samples[0].moment == periods[0].end
+
+
+def test_by_period_in_processes():
+    """Integrating chunks in a pool of processes gives the serial result."""
+    samples = [
+        WattSample(watts=watts, moment=f'2019-11-01T{hour:02}:{minute:02}:00')
+        for watts, (hour, minute) in enumerate(
+            [(13, 0), (13, 10), (13, 40), (14, 50), (15, 5), (15, 35),
+             (15, 36), (17, 0), (17, 2)])
+    ]
+    energy = ElectricalEnergy.from_power_samples(samples)
+
+    serial = energy.by_period(NemDispatchPeriod)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        parallel = energy.by_period(NemDispatchPeriod, executor=executor,
+                                    chunks=3)
+
+    assert [(period.start, period.end) for period in parallel] == \
+        [(period.start, period.end) for period in serial]
+    assert np.array_equal([period.kwh for period in parallel],
+                          [period.kwh for period in serial], equal_nan=True)
+    assert sum(isnan(period.kwh) for period in parallel) > 2
+    for chunked, whole in zip(parallel, serial):
+        if whole.samples is None:
+            assert chunked.samples is None
+        else:
+            assert chunked.samples.epoch_ns.tolist() == \
+                whole.samples.epoch_ns.tolist()
+            assert chunked.samples.watts.tolist() == \
+                whole.samples.watts.tolist()
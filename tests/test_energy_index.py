@@ -0,0 +1,79 @@
+"""Test window queries on a cumulative energy index."""
+import numpy as np
+import pytest
+
+from electric_units import ElectricalEnergy, WattSample
+from electric_units.electrical_energy import TooFewSamples
+from electric_units.energy_index import EnergyIndex
+
+SAMPLES = [
+    WattSample(watts=1000, moment='2019-11-01T12:00:00'),
+    WattSample(watts=3000, moment='2019-11-01T13:00:00'),
+    WattSample(watts=3000, moment='2019-11-01T14:00:00'),
+    WattSample(watts=1000, moment='2019-11-01T16:00:00'),
+]
+
+
+def test_whole_series():
+    """The whole window matches integrating every sample."""
+    index = EnergyIndex.from_power_samples(SAMPLES)
+    expected = ElectricalEnergy.from_power_samples(SAMPLES)
+
+    assert index.total_kwh == pytest.approx(expected.kwh)
+    assert index.energy_between('2019-11-01T12:00:00',
+                                '2019-11-01T16:00:00') == expected
+
+
+def test_interpolated_edges():
+    """Partial intervals match integrating interpolated edge samples."""
+    index = EnergyIndex.from_power_samples(SAMPLES)
+    energy = index.energy_between('2019-11-01T12:30:00',
+                                  '2019-11-01T15:00:00')
+
+    expected = ElectricalEnergy.from_power_samples([
+        WattSample(watts=2000, moment='2019-11-01T12:30:00'),
+        SAMPLES[1], SAMPLES[2],
+        WattSample(watts=2000, moment='2019-11-01T15:00:00'),
+    ])
+    assert energy.kwh == pytest.approx(expected.kwh)
+    assert (energy.start, energy.end) == (expected.start, expected.end)
+
+
+def test_clipped_to_samples():
+    """Windows are clipped to the samples, or rejected outside them."""
+    index = EnergyIndex.from_power_samples(SAMPLES)
+    energy = index.energy_between('2019-11-01T00:00:00',
+                                  '2019-11-01T13:00:00')
+    assert energy.kwh == pytest.approx(2.0)
+    assert energy.start.isoformat() == '2019-11-01T12:00:00'
+
+    with pytest.raises(TooFewSamples):
+        index.energy_between('2019-11-02T00:00:00', '2019-11-02T01:00:00')
+
+
+def test_kwh_between_many():
+    """Many windows are answered at once, 0 outside the samples."""
+    index = EnergyIndex.from_power_samples(SAMPLES)
+    starts = np.array(['2019-11-01T12:00', '2019-11-01T13:00',
+                       '2019-11-02T00:00'], dtype='datetime64[ns]')
+    kwh = index.kwh_between(starts, starts + np.timedelta64(1, 'h'))
+    assert kwh.tolist() == pytest.approx([2.0, 3.0, 0.0])
+
+
+def test_aware_queries():
+    """Queries on aware samples can be naive or aware."""
+    aware = [WattSample(watts=sample.watts,
+                        moment=sample.moment.isoformat() + '+10:00')
+             for sample in SAMPLES]
+    index = EnergyIndex.from_power_samples(aware)
+
+    naive = index.energy_between('2019-11-01T12:00:00',
+                                 '2019-11-01T13:00:00')
+    utc = index.energy_between('2019-11-01T02:00:00+00:00',
+                               '2019-11-01T03:00:00+00:00')
+    assert naive == utc
+    assert naive.kwh == pytest.approx(2.0)
+
+    with pytest.raises(TypeError):
+        EnergyIndex.from_power_samples(SAMPLES).energy_between(
+            naive.start, naive.end)
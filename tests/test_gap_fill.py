@@ -0,0 +1,44 @@
+"""Test filling the energy of empty periods."""
+import numpy as np
+import pytest
+
+from electric_units.utils.gap_fill import fill_gaps
+
+
+def test_gaps_found_from_ordinals():
+    """Each period spans itself and the empty periods after it."""
+    ordinals, kwh, rows = fill_gaps([3, 4, 7, 9], [1.0, 2.0, 5.0, 1.0])
+
+    assert list(ordinals) == [3, 4, 5, 6, 7, 8, 9]
+    assert list(rows) == [1, 3, 2, 1]
+    assert list(kwh[[0, 1, 4, 6]]) == [1.0, 2.0, 5.0, 1.0]
+    assert np.isnan(kwh[[2, 3, 5]]).all()
+
+
+@pytest.mark.parametrize('method, expected', [
+    ('zero', [0.0, 0.0, 0.0]),
+    ('carry', [2.0, 2.0, 5.0]),
+    ('linear', [3.0, 4.0, 3.0]),
+])
+def test_fill_methods(method, expected):
+    """Empty periods are filled in bulk."""
+    _, kwh, _ = fill_gaps([3, 4, 7, 9], [1.0, 2.0, 5.0, 1.0], method)
+    assert list(kwh) == [1.0, 2.0] + expected[:2] + [5.0, expected[2], 1.0]
+
+
+def test_no_fill_across_segments():
+    """Gaps between independent series are not filled."""
+    ordinals, _, rows = fill_gaps([3, 5, 1, 3], [1.0, 1.0, 1.0, 1.0],
+                                  segment_starts=np.array(
+                                      [True, False, True, False]))
+    assert list(ordinals) == [3, 4, 5, 1, 2, 3]
+    assert list(rows) == [2, 1, 2, 1]
+
+
+def test_empty_and_unknown_method():
+    """No periods give no rows, and unknown methods are refused."""
+    ordinals, kwh, rows = fill_gaps([], [])
+    assert len(ordinals) == len(kwh) == len(rows) == 0
+
+    with pytest.raises(ValueError):
+        fill_gaps([1, 3], [1.0, 1.0], 'mean')
@@ -0,0 +1,59 @@
+"""Test the opt-in instrumentation of the hot paths."""
+from electric_units import ElectricalEnergy, NemSettlementPeriod, WattSample
+from electric_units.utils import instrumentation
+from electric_units.utils.instrumentation import (
+    disable_instrumentation, enable_instrumentation, instrumented)
+
+
+def _samples():
+    """Samples from ISO and non ISO strings."""
+    return [
+        WattSample(watts=5000, moment='2019-11-01T13:00:00'),
+        WattSample(watts=5000, moment='1 Nov 2019 13:45'),
+        WattSample(watts=5000, moment='2019-11-01T14:45:00'),
+    ]
+
+
+def test_off_by_default():
+    """Nothing is recorded unless instrumentation is enabled."""
+    assert instrumentation.ACTIVE is None
+    with instrumentation.timed('sort'):
+        pass
+    assert instrumentation.ACTIVE is None
+
+
+def test_stages_counted_and_timed():
+    """Parses, constructions, localizations and by_period stages."""
+    with instrumented() as recorder:
+        samples = _samples()
+        energy = ElectricalEnergy.from_power_samples(samples)
+        energy.by_period(NemSettlementPeriod)
+        period = NemSettlementPeriod('2019-11-01T13:10:00')
+        period.tz_match('2019-11-01T13:10:00')
+    assert instrumentation.ACTIVE is None
+
+    report = recorder.report()
+    assert report['parse.iso']['count'] == 4
+    assert report['parse.dateutil']['count'] == 1
+    assert report['period.construct']['count'] == 1
+    assert report['localize']['count'] == 1
+    assert report['sort']['count'] == 2
+    assert report['integrate']['count'] == report['gap_fill']['count'] == 1
+    assert all(stage['seconds'] >= 0 for stage in report.values())
+
+    metrics = recorder.metrics()
+    assert metrics['electric_units.parse.dateutil.count'] == 1
+    recorder.reset()
+    assert recorder.report() == {}
+
+
+def test_global_switch():
+    """Instrumentation can be enabled for the whole process."""
+    recorder = enable_instrumentation()
+    try:
+        NemSettlementPeriod('2019-11-01T13:10:00')
+    finally:
+        disable_instrumentation()
+    NemSettlementPeriod('2019-11-01T13:10:00')
+
+    assert recorder.report()['period.construct']['count'] == 1
@@ -0,0 +1,98 @@
+"""Test the trapezoidal integration of power samples."""
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import shutil
+from tempfile import gettempdir
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from electric_units import ElectricalEnergy, WattSample
+from electric_units.utils.epoch import (
+    from_epoch_ns, moments_to_epoch_ns, to_epoch_ns)
+from electric_units.utils.integration import (
+    integrate_by_period, interval_kwh, trapezoid_kwh)
+from electric_units.utils.parallel import (
+    _shared_directory, integrate_in_chunks)
+
+
+def test_epoch_round_trip():
+    """Naive and aware datetimes survive a round trip through epoch ns."""
+    naive = datetime(2019, 11, 1, 13, 30, 0, 250)
+    assert from_epoch_ns(to_epoch_ns(naive)) == naive
+
+    sample = WattSample(watts=1, moment='2019-11-01T13:30:00+10:00')
+    aware = sample.moment
+    assert to_epoch_ns(aware) == to_epoch_ns(datetime(2019, 11, 1, 3, 30))
+    assert from_epoch_ns(to_epoch_ns(aware), aware.tzinfo) == aware
+
+
+def test_interval_kwh():
+    """Each interval is weighted by the mean of its 2 samples."""
+    epoch_ns = moments_to_epoch_ns([
+        datetime(2019, 11, 1, 13, 0),
+        datetime(2019, 11, 1, 13, 20),
+        datetime(2019, 11, 1, 13, 30),
+    ])
+    watts = np.array([30000, 60000, 72000])
+
+    assert list(interval_kwh(epoch_ns, watts)) == [15.0, 11.0]
+    assert trapezoid_kwh(epoch_ns, watts) == 26.0
+
+
+def test_gaps_longer_than_a_day():
+    """The full duration between samples is used, not just the seconds."""
+    samples = [
+        WattSample(watts=1000, moment='2019-11-01T13:00:00'),
+        WattSample(watts=1000, moment='2019-11-03T13:00:30'),
+    ]
+    energy = ElectricalEnergy.from_power_samples(samples)
+    assert energy.kwh == pytest.approx(48 + (30 / 3600))
+
+
+def test_matches_pairwise_sum():
+    """A long series integrates to the sum of its parts."""
+    rng = np.random.default_rng(0)
+    epoch_ns = np.cumsum(rng.integers(1, 10 ** 10, size=10000))
+    watts = rng.uniform(0, 5000, size=10000)
+
+    expected = 0
+    for i in range(len(watts) - 1):
+        mean_watts = (watts[i] + watts[i + 1]) / 2
+        expected += (mean_watts / 1000) * ((epoch_ns[i + 1] - epoch_ns[i]) / 3.6e12)
+
+    assert trapezoid_kwh(epoch_ns, watts) == pytest.approx(expected)
+
+
+def test_integrate_in_chunks():
+    """Chunks split at period boundaries join to the whole integral."""
+    rng = np.random.default_rng(1)
+    # Samples with gaps of up to an hour, on 5 minute periods.
+    epoch_ns = np.cumsum(rng.integers(1, 3600, size=5000)) * 10 ** 9
+    watts = rng.uniform(0, 5000, size=5000)
+    period_ns = 300 * 10 ** 9
+
+    whole = integrate_by_period(epoch_ns, watts, period_ns, 3600 * 10 ** 9)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        chunked = integrate_in_chunks(epoch_ns, watts, period_ns,
+                                      3600 * 10 ** 9, executor=executor,
+                                      chunks=3)
+    for field in ('ordinals', 'first', 'offsets', 'epoch_ns', 'watts',
+                  'kwh'):
+        assert np.array_equal(getattr(chunked, field), getattr(whole, field))
+
+
+def test_chunks_without_room_in_shared_memory(monkeypatch):
+    """The columns are shared through the temporary directory instead."""
+    monkeypatch.setattr(shutil, 'disk_usage',
+                        lambda path: SimpleNamespace(free=0))
+    assert _shared_directory(1) == gettempdir()
+
+    epoch_ns = np.arange(0, 3600, 7) * 10 ** 9
+    watts = np.ones(len(epoch_ns))
+    whole = integrate_by_period(epoch_ns, watts, 300 * 10 ** 9)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        chunked = integrate_in_chunks(epoch_ns, watts, 300 * 10 ** 9,
+                                      executor=executor, chunks=2)
+    assert np.array_equal(chunked.kwh, whole.kwh)
@@ -0,0 +1,46 @@
+"""Test that importing the package defers its heavy dependencies."""
+import subprocess
+import sys
+
+import pytest
+
+import electric_units
+
+
+def _imported_after(statement):
+    """The heavy modules loaded by a statement, in a fresh interpreter."""
+    script = (f"import sys\n{statement}\n"
+              "print(' '.join(name for name in "
+              "('numpy', 'pandas', 'dateutil') if name in sys.modules))")
+    result = subprocess.run([sys.executable, '-c', script], check=True,
+                            capture_output=True, text=True)
+    return result.stdout.split()
+
+
+@pytest.mark.parametrize('statement', [
+    "import electric_units",
+    "from electric_units import NemSettlementPeriod",
+    "from electric_units import NemSettlementPeriod\n"
+    "NemSettlementPeriod('2019-11-01T13:00:00').period_id",
+])
+def test_periods_without_heavy_imports(statement):
+    """A settlement period needs none of NumPy, pandas or dateutil."""
+    assert _imported_after(statement) == []
+
+
+def test_heavy_imports_on_first_use():
+    """Dependencies are imported when a unit that needs them is used."""
+    assert _imported_after(
+        "from electric_units import NemSettlementPeriod\n"
+        "NemSettlementPeriod('1 Nov 2019 13:00')") == ['dateutil']
+    assert 'numpy' in _imported_after(
+        "from electric_units import ElectricalEnergy")
+
+
+def test_exports():
+    """Every export resolves, and unknown names are still errors."""
+    for name in electric_units.__all__:
+        assert getattr(electric_units, name).__name__ == name
+    assert set(electric_units.__all__) <= set(dir(electric_units))
+    with pytest.raises(AttributeError):
+        electric_units.NotAUnit  # pylint: disable=pointless-statement
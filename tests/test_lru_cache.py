@@ -0,0 +1,29 @@
+"""Test the bounded LRU cache."""
+from electric_units.utils.lru_cache import CacheInfo, LRUCache
+
+
+def test_least_recently_used_is_dropped():
+    """A full cache drops the entry that was used longest ago."""
+    cache = LRUCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert cache.info() == CacheInfo(hits=3, misses=1, maxsize=2, currsize=2)
+
+
+def test_resize_and_clear():
+    """Shrinking trims the cache, clearing resets the statistics."""
+    cache = LRUCache(maxsize=3)
+    for key in 'abc':
+        cache.put(key, key)
+    cache.resize(1)
+    assert cache.get('c') == 'c'
+    assert cache.get('a') is None
+
+    cache.clear()
+    assert cache.info() == CacheInfo(hits=0, misses=0, maxsize=1, currsize=0)
@@ -0,0 +1,95 @@
+"""Test aggregating many meters' samples by period."""
+from concurrent.futures import ProcessPoolExecutor
+from math import isnan
+import numpy as np
+import pytest
+
+from electric_units import ElectricalEnergy, NemSettlementPeriod, WattSample
+from electric_units.electrical_energy import TooFewSamples
+from electric_units.meters import by_meter_period
+
+
+def _meter_samples():
+    """Samples for 3 meters, with gaps, in no particular order."""
+    return {
+        'b': [WattSample(watts=10000, moment='2019-11-01T13:00:00'),
+              WattSample(watts=20000, moment='2019-11-01T13:45:00'),
+              WattSample(watts=10000, moment='2019-11-01T13:30:00'),
+              WattSample(watts=5000, moment='2019-11-01T15:40:00')],
+        'a': [WattSample(watts=1000, moment='2019-11-01T14:10:00'),
+              WattSample(watts=3000, moment='2019-11-01T14:20:00')],
+        'c': [WattSample(watts=7000, moment='2019-11-01T12:50:00'),
+              WattSample(watts=9000, moment='2019-11-01T13:10:00')],
+    }
+
+
+def _columns(meter_samples):
+    """Interleave every meter's samples into columns."""
+    rows = [(meter_id, sample.moment, sample.watts)
+            for meter_id, samples in meter_samples.items()
+            for sample in samples]
+    rows = rows[::2] + rows[1::2]
+    meter_ids, moments, watts = zip(*rows)
+    return list(meter_ids), list(moments), list(watts)
+
+
+@pytest.mark.parametrize('processes', [None, 2])
+def test_by_meter_period_matches_by_period(processes):
+    """Each meter's rows are the periods by_period finds for it alone."""
+    meter_samples = _meter_samples()
+    if processes is None:
+        result = by_meter_period(*_columns(meter_samples),
+                                 period_class=NemSettlementPeriod)
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            result = by_meter_period(*_columns(meter_samples),
+                                     period_class=NemSettlementPeriod,
+                                     executor=executor, chunks=3)
+
+    energies = result.energies()
+    assert sorted(energies) == ['a', 'b', 'c']
+    for meter_id, samples in meter_samples.items():
+        expected = ElectricalEnergy.from_power_samples(samples).by_period(
+            NemSettlementPeriod)
+        assert len(energies[meter_id]) == len(expected)
+        for energy, expected_energy in zip(energies[meter_id], expected):
+            assert energy.start == expected_energy.start
+            assert energy.end == expected_energy.end
+            if isnan(expected_energy.kwh):
+                assert isnan(energy.kwh)
+            else:
+                assert energy.kwh == pytest.approx(expected_energy.kwh)
+
+
+def test_rows_sorted_by_meter_and_period():
+    """Rows are columns, ordered by meter then period, with gaps filled."""
+    result = by_meter_period(*_columns(_meter_samples()),
+                             period_class=NemSettlementPeriod)
+
+    assert list(result.meter_ids) == ['a'] + (['b'] * 6) + (['c'] * 2)
+    assert len(result) == 9
+    assert np.all(np.diff(result.ordinals[1:7]) == 1)
+    assert np.isnan(result.kwh[3:6]).all()
+    assert result.periods()[0] == NemSettlementPeriod('2019-11-01T14:00:00')
+
+
+def test_mismatched_columns():
+    """The columns must all be the same length."""
+    with pytest.raises(ValueError):
+        by_meter_period(['a'], ['2019-11-01T13:00:00'] * 2, [1, 2],
+                        period_class=NemSettlementPeriod)
+
+
+def test_meter_with_one_sample():
+    """A meter with a single sample has no energy, as with by_period."""
+    meter_ids, moments, watts = _columns(_meter_samples())
+    meter_ids.append('d')
+    moments.append(moments[0])
+    watts.append(1000)
+
+    with pytest.raises(TooFewSamples):
+        ElectricalEnergy.from_power_samples(
+            [WattSample(watts=1000, moment='2019-11-01T13:10:00')])
+    with pytest.raises(TooFewSamples):
+        by_meter_period(meter_ids, moments, watts,
+                        period_class=NemSettlementPeriod)
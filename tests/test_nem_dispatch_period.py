@@ -2,6 +2,7 @@
 same as the NemSettlementPeriod object, so it doesn't require the same tests"""
 from datetime import datetime
 from pytz import timezone
+import numpy as np
 import pytest
 
 from electric_units import NemDispatchPeriod
@@ -46,4 +47,41 @@ def test_nem_accuracy(moment, start, period_id, dispatch_interval):
     assert period.start == start
     assert period.period_id == period_id
     assert period.dispatch_interval == dispatch_interval
-	
\ No newline at end of file
+
+
+@pytest.mark.parametrize("moment, start, dispatch_interval",
+                         [(row[0], row[1], row[3]) for row in NEM_DATA])
+def test_from_dispatch_interval(moment, start, dispatch_interval):
+    """Interval strings and integers parse back to their period."""
+    period = NemDispatchPeriod(moment)
+    assert NemDispatchPeriod.from_dispatch_interval(dispatch_interval) == period
+    assert NemDispatchPeriod.from_dispatch_interval(
+        int(dispatch_interval)).start == start
+
+
+def test_dispatch_intervals_vectorized():
+    """Whole columns of ordinals and intervals convert either way."""
+    intervals = np.array([row[3] for row in NEM_DATA])
+    ordinals = NemDispatchPeriod.dispatch_interval_ordinals(intervals)
+
+    assert list(ordinals) == [NemDispatchPeriod(row[0]).ordinal
+                              for row in NEM_DATA]
+    assert list(NemDispatchPeriod.dispatch_intervals(ordinals).astype(str)) \
+        == list(intervals)
+
+
+def test_scalar_dispatch_interval_matches_column():
+    """A period's own interval agrees with the vectorised one."""
+    first = NemDispatchPeriod('2020-02-28T03:00:00').ordinal
+    ordinals = np.arange(first, first + (3 * 288))
+    assert [NemDispatchPeriod.from_ordinal(ordinal).dispatch_interval
+            for ordinal in ordinals.tolist()] == \
+        list(NemDispatchPeriod.dispatch_intervals(ordinals).astype(str))
+
+
+@pytest.mark.parametrize("interval", [
+    "20191001000", "20191001289", "20190931001", "20191301001"])
+def test_invalid_dispatch_interval(interval):
+    """Out of range dates and period IDs are refused."""
+    with pytest.raises(ValueError):
+        NemDispatchPeriod.from_dispatch_interval(interval)
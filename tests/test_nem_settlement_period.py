@@ -4,6 +4,7 @@ from pytz import timezone
 import pytest
 
 from electric_units import NemSettlementPeriod
+from electric_units.base_settlement_period import BaseSettlementPeriod
 
 
 def test_can_create():
@@ -105,3 +106,47 @@ def test_class_localize():
     utc_time_str = "2019-01-01T12:00:00Z"
     localized_utc_str = NemSettlementPeriod.localize(utc_time_str).isoformat()
     assert localized_utc_str == "2019-01-01T22:00:00+10:00"
+
+
+def test_interned_periods():
+    """Every moment in a period shares one cached instance."""
+    NemSettlementPeriod.clear_cache()
+    first = NemSettlementPeriod.interned('2020-02-25T12:01:00')
+    second = NemSettlementPeriod.interned(datetime(2020, 2, 25, 12, 29, 59))
+    utc_moment = timezone('UTC').localize(datetime(2020, 2, 25, 2, 15))
+
+    assert first is second
+    assert first is NemSettlementPeriod.interned(utc_moment)
+    assert first == NemSettlementPeriod('2020-02-25T12:15:00')
+    assert first.moment == first.start
+
+    info = NemSettlementPeriod.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (2, 1, 1)
+
+
+def test_interned_cache_is_bounded():
+    """The least recently used periods are dropped from the cache."""
+    NemSettlementPeriod.clear_cache()
+    NemSettlementPeriod.resize_cache(2)
+    try:
+        early = NemSettlementPeriod.interned('2020-02-25T12:00:00')
+        NemSettlementPeriod.interned('2020-02-25T12:30:00')
+        NemSettlementPeriod.interned('2020-02-25T13:00:00')
+        assert NemSettlementPeriod.cache_info().currsize == 2
+        assert NemSettlementPeriod.interned('2020-02-25T12:00:00') is not early
+    finally:
+        NemSettlementPeriod.resize_cache(4096)
+
+
+def test_freq_minutes_class_attribute():
+    """Periods are as long as their class's freq_minutes attribute."""
+    class HourPeriod(NemSettlementPeriod):
+        """An hour long period, on the NEM's clock."""
+        freq_minutes = 60
+
+    period = HourPeriod('2019-11-01T13:45:00')
+    assert period.start.hour == 13 and period.end.hour == 14
+    assert HourPeriod.freq_ns() == 3600 * 10 ** 9
+
+    with pytest.raises(NotImplementedError):
+        BaseSettlementPeriod.freq_ns()
@@ -0,0 +1,39 @@
+"""Test the .nem accessor on datetime columns."""
+# pylint: disable=no-member
+from pandas import DatetimeIndex, Series, date_range, isna
+import pytest
+
+from electric_units import NemDispatchPeriod, NemSettlementPeriod
+import electric_units.pandas_compat  # pylint: disable=unused-import
+
+
+def test_matches_period_objects():
+    """Every attribute agrees with the period objects, row by row."""
+    moments = Series(date_range('2019-09-30T23:50', periods=300, freq='1min'))
+    nem = moments.nem
+
+    for row, moment in enumerate(moments.dt.to_pydatetime()):
+        dispatch = NemDispatchPeriod(moment)
+        settlement = NemSettlementPeriod(moment)
+        assert nem.dispatch_interval[row] == dispatch.dispatch_interval
+        assert nem.dispatch_period_id[row] == dispatch.period_id
+        assert nem.dispatch_period_start[row] == dispatch.start
+        assert nem.settlement_period_id[row] == settlement.period_id
+        assert nem.settlement_period_end[row] == settlement.end
+        assert nem.settlement_period[row] == settlement
+
+
+def test_index_and_missing_values():
+    """A DatetimeIndex, with a timezone and NaT, can be used too."""
+    index = DatetimeIndex(['2019-10-01T18:00:00Z', None])
+
+    assert list(index.nem.dispatch_interval) == ["20191002001", None]
+    assert index.nem.settlement_period_id[0] == 9
+    assert isna(index.nem.settlement_period_id[1])
+    assert isna(index.nem.settlement_period_start[1])
+
+
+def test_only_datetimes():
+    """Other columns don't have the accessor."""
+    with pytest.raises(AttributeError):
+        _ = Series([1, 2]).nem
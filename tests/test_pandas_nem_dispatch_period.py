@@ -0,0 +1,72 @@
+"""Are the dispatch periods usable within pandas."""
+from pandas import DataFrame, Series, factorize
+
+from electric_units import NemDispatchPeriod, NemSettlementPeriod
+from electric_units.pandas_compat import (
+    NemDispatchPeriodArray, NemSettlementPeriodArray)
+
+
+def test_pandas_extension():
+    """Can you build a series with the dispatch period."""
+    series = Series(['2019-10-01T03:59:00', '2019-10-01T04:07:00'],
+                    dtype="nem_dispatch_period")
+
+    assert series.dtype == 'nem_dispatch_period'
+    assert series[0].period_id == 288
+    assert series[1] == NemDispatchPeriod('2019-10-01T04:05:00')
+    assert series.nbytes == 2 * 8
+
+
+def test_sort_and_factorize():
+    """Sorting and factorizing follow time, across the 4:00AM reset."""
+    periods = NemDispatchPeriodArray([
+        '2019-10-01T04:07:00', None, '2019-10-01T03:59:00',
+        '2019-10-01T04:09:00'])
+
+    ordered = Series(periods).sort_values()
+    assert [period.period_id for period in ordered.dropna()] == [288, 2, 2]
+    assert ordered.isna().iloc[-1]
+
+    codes, uniques = factorize(periods)
+    assert list(codes) == [0, -1, 1, 0]
+    assert list(uniques) == [periods[0], periods[2]]
+
+
+def test_group_by_dispatch_period():
+    """Can you take an average of data within the same period."""
+    data = DataFrame({
+        "prices": [10, 20, 80],
+        "periods": NemDispatchPeriodArray([
+            '2019-01-02T10:01:00', '2019-01-02T10:04:00', '2019-01-02T10:05:00'])
+    })
+    assert list(data.groupby('periods').prices.mean()) == [15, 80]
+
+
+def test_convert_to_and_from_settlement_periods():
+    """Dispatch periods roll up into, and down from, settlement periods."""
+    dispatch = Series(NemDispatchPeriodArray(
+        ['2019-10-01T03:59:00', '2019-10-01T04:07:00', None]))
+    settlement = dispatch.astype('nem_settlement_period')
+
+    assert settlement.dtype == 'nem_settlement_period'
+    assert settlement[0] == NemSettlementPeriod('2019-10-01T03:30:00')
+    assert settlement[1] == NemSettlementPeriod('2019-10-01T04:00:00')
+    assert settlement.isna()[2]
+
+    back = NemSettlementPeriodArray(settlement).to_period_array(
+        NemDispatchPeriodArray)
+    assert back[0] == NemDispatchPeriod('2019-10-01T03:30:00')
+
+
+def test_dispatch_interval_column():
+    """A column of intervals converts to periods and back, keeping NA."""
+    intervals = Series(["20190930288", None, "20191001002"])
+    periods = NemDispatchPeriodArray.from_dispatch_intervals(intervals)
+
+    assert periods[0] == NemDispatchPeriod('2019-10-01T03:59:00')
+    assert periods.isna()[1]
+    assert list(periods.dispatch_intervals()) == list(intervals)
+
+    from_ints = NemDispatchPeriodArray.from_dispatch_intervals(
+        [20190930288, 20191001002])
+    assert list(from_ints.ordinals) == list(periods.ordinals[[0, 2]])
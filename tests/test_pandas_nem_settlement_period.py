@@ -1,5 +1,5 @@
 """Are the units usable within pandas."""
-from pandas import DataFrame, Series
+from pandas import DataFrame, Series, concat, isna, to_datetime
 
 from electric_units.pandas_compat import NemSettlementPeriodArray
 
@@ -43,3 +43,52 @@ def test_group_by_period_id():
 
     assert data.groupby('datetimes').prices.mean()[0] == 15
     assert data.groupby('datetimes').prices.mean()[1] == 60
+
+
+def test_missing_periods():
+    """Missing values are stored, found and filled without objects."""
+    periods = NemSettlementPeriodArray(
+        ['2019-01-01T10:00:00', None, '2019-01-01T12:00:00'])
+
+    assert list(periods.isna()) == [False, True, False]
+    assert periods.nbytes == 3 * 8
+    assert isna(periods[1])
+
+    shifted = Series(periods).shift(1)
+    assert list(shifted.isna()) == [True, False, True]
+    assert shifted[1] == periods[0]
+
+    strings = NemSettlementPeriodArray(['2019-01-01T10:00:00', 'NaT', ''])
+    assert list(strings.isna()) == [False, True, True]
+
+
+def test_vectorised_operations():
+    """Take, concatenate, copy and compare work on the ordinals."""
+    periods = NemSettlementPeriodArray(to_datetime(
+        ['2019-01-01T10:00:00', '2019-01-01T10:20:00', '2019-01-01T12:00:00']))
+
+    assert list(periods == periods[0]) == [True, True, False]
+    assert list(periods.take([2, -1], allow_fill=True).isna()) == [False, True]
+
+    combined = concat([Series(periods), Series(periods.copy())])
+    assert len(combined) == 6
+    assert combined.iloc[5].period_id == 25
+    assert (periods.ordinals[1] - periods.ordinals[0]) == 0
+
+
+def test_unique_value_counts_and_search():
+    """Unique, value_counts and searchsorted work on period ordinals."""
+    periods = NemSettlementPeriodArray([
+        '2019-01-02T10:01:00', '2019-01-02T11:00:00', None,
+        '2019-01-02T10:05:00'])
+    series = Series(periods)
+
+    assert series.nunique() == 2
+    assert len(periods.unique()) == 3
+    counts = series.value_counts()
+    assert counts[periods[0]] == 2
+    assert counts[periods[1]] == 1
+
+    ordered = NemSettlementPeriodArray(series.dropna().sort_values())
+    assert ordered.searchsorted('2019-01-02T10:45:00') == 2
+    assert list(ordered.searchsorted(ordered, side='right')) == [2, 2, 3]
@@ -0,0 +1,63 @@
+"""Test ranges of periods."""
+import numpy as np
+import pytest
+
+from electric_units import (
+    NemDispatchPeriod, NemSettlementPeriod, PeriodRange, period_range)
+
+
+def _stepped_periods(period_class, start, end):
+    """Periods found by constructing each from the last one's end."""
+    periods = [period_class(start)]
+    while periods[-1].end < periods[-1].tz_match(end):
+        periods.append(period_class(periods[-1].end))
+    return periods
+
+
+@pytest.mark.parametrize('start, end', [
+    ('2019-11-01T09:00:00', '2019-11-01T11:30:00'),
+    ('2019-11-01T09:10:00', '2019-11-01T11:31:00'),
+    ('2019-11-01T09:10:00', '2019-11-01T09:10:00'),
+    ('2019-11-01T09:10:00', '2019-11-01T08:00:00'),
+    ('2019-10-31T23:10:00+00:00', '2019-11-01T01:00:00+00:00'),
+])
+@pytest.mark.parametrize('period_class',
+                         [NemSettlementPeriod, NemDispatchPeriod])
+def test_same_periods_as_stepping(period_class, start, end):
+    """The range holds the periods found by stepping between the moments."""
+    periods = period_range(period_class, start, end)
+    assert periods == _stepped_periods(period_class, start, end)
+    assert list(periods) == _stepped_periods(period_class, start, end)
+
+
+def test_len_and_indexing():
+    """A year of dispatch periods is counted and indexed without creating them."""
+    periods = period_range(NemDispatchPeriod,
+                           '2019-01-01T00:00:00', '2020-01-01T00:00:00')
+
+    assert len(periods) == 105120
+    assert periods[0] == NemDispatchPeriod('2019-01-01T00:00:00')
+    assert periods[-1] == NemDispatchPeriod('2019-12-31T23:55:00')
+    assert periods[288] == NemDispatchPeriod('2019-01-02T00:00:00')
+    assert NemDispatchPeriod('2019-06-01T12:00:00') in periods
+    assert NemDispatchPeriod('2020-01-01T00:00:00') not in periods
+    assert NemSettlementPeriod('2019-06-01T12:00:00') not in periods
+    with pytest.raises(IndexError):
+        assert periods[105120]
+
+
+def test_slices_and_ordinals():
+    """Slices are ranges, and the ordinals are an int64 array."""
+    periods = period_range(NemSettlementPeriod,
+                           '2019-11-01T00:00:00', '2019-11-02T00:00:00')
+
+    morning = periods[:24]
+    assert isinstance(morning, PeriodRange)
+    assert len(morning) == 24
+    assert morning.end == NemSettlementPeriod('2019-11-01T12:00:00').start
+    assert periods.start == periods[0].start
+
+    assert periods.ordinals.dtype == np.int64
+    assert np.all(np.diff(periods.ordinals) == 1)
+    with pytest.raises(ValueError):
+        assert periods[::2]
@@ -0,0 +1,73 @@
+"""Test resampling power samples onto a uniform grid."""
+from datetime import timedelta
+
+import numpy as np
+import pytest
+
+from electric_units import (
+    ElectricalEnergy, NemDispatchPeriod, NemSettlementPeriod, WattSample)
+from electric_units.resampling import resample
+
+SAMPLES = [
+    WattSample(watts=1000, moment='2019-11-01T12:00:00'),
+    WattSample(watts=3000, moment='2019-11-01T12:07:30'),
+    WattSample(watts=3000, moment='2019-11-01T12:12:00'),
+]
+
+
+def test_trapezoid():
+    """The trapezoid rule interpolates between samples."""
+    resampled = resample(SAMPLES, timedelta(minutes=5))
+
+    assert resampled.samples().moment_at(0).isoformat() == '2019-11-01T12:00:00'
+    assert len(resampled) == 3
+    # 12:00 to 12:05 ramps from 1000 to 2333 watts.
+    assert resampled.watts[0] == pytest.approx(5000 / 3)
+    # The last interval is only covered to 12:12.
+    assert resampled.watts[2] == pytest.approx(3000)
+    assert resampled.kwh.sum() == pytest.approx(
+        ElectricalEnergy.from_power_samples(SAMPLES).kwh)
+
+
+@pytest.mark.parametrize('rule, watts', [
+    ('previous', [1000, 2000, 3000]),
+    ('next', [3000, 3000, 3000]),
+])
+def test_step_rules(rule, watts):
+    """Step rules hold the earlier, or later, sample's power."""
+    resampled = resample(SAMPLES, timedelta(minutes=5), rule=rule)
+    assert resampled.watts.tolist() == pytest.approx(watts)
+
+    with pytest.raises(ValueError):
+        resample(SAMPLES, timedelta(minutes=5), rule='spline')
+
+
+def test_period_grid():
+    """Grids of periods line up with their boundaries."""
+    samples = [WattSample(watts=1000, moment=f'2019-11-01T12:{minute:02}:00')
+               for minute in (3, 17, 44)]
+    dispatch = resample(samples, NemDispatchPeriod)
+    energies = dispatch.energies()
+
+    assert energies[0].start == NemDispatchPeriod(energies[0].start).start
+    assert [energy.start.minute for energy in energies] == \
+        list(range(0, 45, 5))
+    assert dispatch.kwh.sum() == pytest.approx(41 / 60)
+
+    settlement = resample(samples, NemSettlementPeriod)
+    assert settlement.epoch_ns.tolist() == [
+        NemSettlementPeriod('2019-11-01T12:00:00').start.timestamp() * 1e9,
+        NemSettlementPeriod('2019-11-01T12:30:00').start.timestamp() * 1e9]
+    assert np.allclose(settlement.watts, 1000)
+
+
+def test_aware_grid_on_local_clock():
+    """Grids of aware samples line up with their local clock."""
+    samples = [WattSample(watts=1000, moment=f'2019-11-01T{hour}:00+05:30')
+               for hour in ('12:00', '13:00', '14:00')]
+    resampled = resample(samples, timedelta(days=1))
+
+    assert len(resampled) == 1
+    assert resampled.samples().moment_at(0).isoformat() == \
+        '2019-11-01T00:00:00+05:30'
+    assert resampled.kwh[0] == pytest.approx(2.0)
@@ -0,0 +1,83 @@
+"""Test rolling dispatch period energy up into settlement periods."""
+from math import isnan
+import numpy as np
+import pytest
+
+from electric_units import (
+    ElectricalEnergy, NemDispatchPeriod, NemSettlementPeriod, WattSample)
+from electric_units.rollup import period_mapping, rollup, rollup_ordinals
+
+
+def test_period_mapping():
+    """A settlement period is 6 dispatch periods, and not the other way."""
+    assert period_mapping(NemDispatchPeriod, NemSettlementPeriod) == 6
+    with pytest.raises(ValueError):
+        period_mapping(NemSettlementPeriod, NemDispatchPeriod)
+
+
+def test_rollup_by_period():
+    """Dispatch energies sum to settlement energies, keeping the gaps."""
+    samples = [
+        WattSample(watts=6000, moment=f'2019-11-01T13:{minute:02}:00')
+        for minute in range(0, 30, 5)
+    ] + [
+        WattSample(watts=12000, moment='2019-11-01T14:35:00'),
+        WattSample(watts=12000, moment='2019-11-01T14:55:00'),
+    ]
+    energy = ElectricalEnergy.from_power_samples(samples)
+    dispatch = energy.by_period(NemDispatchPeriod)
+
+    settlement = rollup(dispatch, NemDispatchPeriod, NemSettlementPeriod)
+    expected = energy.by_period(NemSettlementPeriod)
+
+    assert [period.start for period in settlement] == \
+        [period.start for period in expected]
+    assert settlement[0].kwh == pytest.approx(expected[0].kwh)
+    assert settlement[0].kwh == pytest.approx(3.0)
+    assert all(isnan(period.kwh) for period in settlement[1:])
+
+
+def test_rollup_partial_periods():
+    """Partly covered periods are NaN, unless their sum is asked for."""
+    samples = [
+        WattSample(watts=12000, moment='2019-11-01T14:35:00'),
+        WattSample(watts=12000, moment='2019-11-01T14:55:00'),
+    ]
+    energy = ElectricalEnergy.from_power_samples(samples)
+    dispatch = energy.by_period(NemDispatchPeriod)
+
+    settlement = rollup(dispatch, NemDispatchPeriod, NemSettlementPeriod)
+    assert len(settlement) == 1 and isnan(settlement[0].kwh)
+
+    # Only 14:35 and 14:55 have dispatch energies, where by_period holds
+    # the samples' power across the whole settlement period.
+    summed = rollup(dispatch, NemDispatchPeriod, NemSettlementPeriod,
+                    partial='sum')
+    assert summed[0].kwh == pytest.approx(2.0)
+    assert energy.by_period(NemSettlementPeriod)[0].kwh == \
+        pytest.approx(6.0)
+
+    with pytest.raises(ValueError):
+        rollup(dispatch, NemDispatchPeriod, NemSettlementPeriod,
+               partial='mean')
+
+
+def test_rollup_coverage_and_segments():
+    """Coverage counts the known dispatch periods, per series."""
+    start = NemDispatchPeriod('2019-11-01T13:00:00').ordinal
+    ordinals = start + np.array([0, 1, 2, 6, 7, 0, 1])
+    kwh = np.array([1.0, np.nan, 2.0, np.nan, np.nan, 4.0, 4.0])
+    segment_starts = np.array([True] + ([False] * 4) + [True, False])
+
+    result = rollup_ordinals(ordinals, kwh, NemDispatchPeriod,
+                             NemSettlementPeriod,
+                             segment_starts=segment_starts)
+
+    assert len(result) == 3
+    assert list(result.ordinals - result.ordinals[0]) == [0, 1, 0]
+    assert list(result.first) == [0, 3, 5]
+    assert result.kwh[0] == 3.0 and isnan(result.kwh[1])
+    assert result.kwh[2] == 8.0
+    assert list(result.coverage) == pytest.approx([2 / 6, 0, 2 / 6])
+    assert result.energies()[2].start == NemSettlementPeriod(
+        '2019-11-01T13:00:00').start
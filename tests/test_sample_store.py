@@ -0,0 +1,101 @@
+"""Test the memory mapped sample store."""
+import numpy as np
+import pytest
+
+from electric_units import (
+    ElectricalEnergy, NemDispatchPeriod, NemSettlementPeriod, WattSample,
+    WattSampleArray)
+from electric_units.sample_store import SampleStore
+
+
+def _samples(first_minute, count):
+    """Samples every 10 minutes, as naive AEST moments."""
+    epoch_ns = np.datetime64('2019-11-01T12:00', 'ns') + \
+        np.arange(first_minute, first_minute + 10 * count, 10).astype(
+            'timedelta64[m]')
+    return WattSampleArray(epoch_ns=epoch_ns,
+                           watts=np.arange(count, dtype=float) * 1000)
+
+
+def test_create_and_reopen(tmp_path):
+    """Samples written to a store are read back from its maps."""
+    path = str(tmp_path / 'meter')
+    SampleStore.create(path, NemSettlementPeriod, _samples(0, 12))
+
+    store = SampleStore(path)
+    assert store.period_class is NemSettlementPeriod
+    assert len(store) == 12
+    assert isinstance(store.epoch_ns, np.memmap)
+    # One index entry per half hour with samples.
+    assert store.index_offsets.tolist() == [0, 3, 6, 9]
+
+
+def test_window_is_a_view(tmp_path):
+    """A window shares memory with the maps, and excludes its end."""
+    store = SampleStore.create(str(tmp_path), NemSettlementPeriod,
+                               _samples(0, 12))
+    window = store.window('2019-11-01T12:10:00', '2019-11-01T13:00:00')
+
+    assert np.shares_memory(window.epoch_ns, store.epoch_ns)
+    assert window.watts.tolist() == [1000, 2000, 3000, 4000, 5000]
+    assert window.moment_at(0).isoformat() == '2019-11-01T12:10:00+10:00'
+    assert len(store.window('2019-11-02T00:00:00',
+                            '2019-11-03T00:00:00')) == 0
+
+
+def test_periods(tmp_path):
+    """Whole periods are found from the index alone."""
+    store = SampleStore.create(str(tmp_path), NemSettlementPeriod,
+                               _samples(0, 12))
+    first = NemSettlementPeriod('2019-11-01T12:30:00')
+    last = NemSettlementPeriod('2019-11-01T13:30:00')
+
+    assert store.periods(first).watts.tolist() == [3000, 4000, 5000]
+    assert len(store.periods(first, last)) == 9
+
+    with pytest.raises(TypeError):
+        store.periods(NemDispatchPeriod('2019-11-01T12:30:00'))
+
+
+def test_append(tmp_path):
+    """Appended samples continue the index, within an indexed period."""
+    store = SampleStore.create(str(tmp_path), NemSettlementPeriod,
+                               _samples(0, 2))
+    store.append(_samples(20, 4))
+
+    assert len(store) == 6
+    assert store.index_offsets.tolist() == [0, 3]
+    assert len(SampleStore(str(tmp_path))) == 6
+
+    with pytest.raises(ValueError):
+        store.append([WattSample(watts=1, moment='2019-11-01T12:00:00')])
+
+
+def test_window_feeds_by_period(tmp_path):
+    """A window integrates the same as the samples it came from."""
+    samples = _samples(0, 12)
+    store = SampleStore.create(str(tmp_path), NemSettlementPeriod, samples)
+    window = store.window('2019-11-01T12:00:00', '2019-11-01T14:00:00')
+
+    expected = ElectricalEnergy.from_power_samples(samples).by_period(
+        NemSettlementPeriod)
+    energies = ElectricalEnergy.from_power_samples(window).by_period(
+        NemSettlementPeriod)
+    assert [energy.kwh for energy in energies] == \
+        pytest.approx([energy.kwh for energy in expected])
+
+
+def test_unfinished_append(tmp_path):
+    """Rows from an append that didn't finish are ignored, then replaced."""
+    path = str(tmp_path)
+    SampleStore.create(path, NemSettlementPeriod, _samples(0, 3))
+    # An append that wrote a sample time, but crashed before its power.
+    with open(tmp_path / 'epoch_ns.i8', 'ab') as column_file:
+        column_file.write(np.int64(0).tobytes())
+
+    store = SampleStore(path)
+    assert len(store) == len(store.watts) == 3
+
+    store.append(_samples(30, 2))
+    assert SampleStore(path).watts.tolist() == [0, 1000, 2000, 0, 1000]
+    assert SampleStore(path).index_offsets.tolist() == [0, 3]
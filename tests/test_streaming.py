@@ -0,0 +1,195 @@
+"""Test aggregating a stream of power samples by period."""
+from datetime import timedelta
+from math import isnan
+import random
+import numpy as np
+import pytest
+
+from electric_units import (
+    ElectricalEnergy, NemDispatchPeriod, NemSettlementPeriod, WattSample,
+    WattSampleArray)
+from electric_units.streaming import (
+    OutOfOrderSample, PeriodEnergyAggregator, WatermarkEnergyAggregator,
+    stream_by_period)
+from electric_units.utils.epoch import to_epoch_ns
+
+
+def _samples():
+    """Samples across several periods, with a gap of empty periods."""
+    return [
+        WattSample(watts=10000, moment='2019-11-01T13:00:00'),
+        WattSample(watts=10000, moment='2019-11-01T13:30:00'),
+        WattSample(watts=20000, moment='2019-11-01T13:45:00'),
+        WattSample(watts=10000, moment='2019-11-01T14:05:00'),
+        WattSample(watts=30000, moment='2019-11-01T14:15:00'),
+        WattSample(watts=5000, moment='2019-11-01T15:40:00'),
+        WattSample(watts=7000, moment='2019-11-01T15:50:00'),
+    ]
+
+
+def _assert_same_energies(streamed, expected):
+    """Streamed energies match `by_period`, without carrying samples."""
+    assert len(streamed) == len(expected)
+    for energy, expected_energy in zip(streamed, expected):
+        assert energy.start == expected_energy.start
+        assert energy.end == expected_energy.end
+        assert energy.samples is None
+        if isnan(expected_energy.kwh):
+            assert isnan(energy.kwh)
+        else:
+            assert energy.kwh == pytest.approx(expected_energy.kwh)
+
+
+@pytest.mark.parametrize('period_class',
+                         [NemSettlementPeriod, NemDispatchPeriod])
+def test_stream_matches_by_period(period_class):
+    """Streaming one sample at a time gives the same periods as by_period."""
+    samples = _samples()
+    expected = ElectricalEnergy.from_power_samples(samples).by_period(
+        period_class)
+
+    _assert_same_energies(list(stream_by_period(samples, period_class)),
+                          expected)
+
+
+def test_stream_of_batches_matches_by_period():
+    """Batches, as lists or arrays, can be mixed with single samples."""
+    samples = _samples()
+    expected = ElectricalEnergy.from_power_samples(samples).by_period(
+        NemSettlementPeriod)
+
+    stream = [samples[:2], samples[2],
+              WattSampleArray.from_samples(samples[3:6]), [], samples[6:]]
+    _assert_same_energies(
+        list(stream_by_period(stream, NemSettlementPeriod)), expected)
+
+
+def test_periods_emitted_as_they_close():
+    """A period is only returned once a sample crosses its end."""
+    samples = _samples()
+    aggregator = PeriodEnergyAggregator(NemSettlementPeriod)
+
+    assert aggregator.push(samples[0]) == []
+    finished = aggregator.push(samples[1])
+    assert len(finished) == 1
+    assert finished[0].kwh == 5.0
+    assert finished[0].start == NemSettlementPeriod(
+        '2019-11-01T13:00:00').start
+
+    assert aggregator.push(samples[2]) == []
+    finished = aggregator.push_many(samples[3:])
+    # 13:30 and 14:00 close, then 14:30 and 15:00 are empty.
+    assert len(finished) == 4
+    assert all(isnan(energy.kwh) for energy in finished[2:])
+
+    finished = aggregator.flush()
+    assert len(finished) == 1
+    assert aggregator.flush() == []
+
+
+def test_timezone_aware_samples():
+    """Aware samples are converted to the period's timezone."""
+    sample_1 = WattSample(watts=1000, moment='2019-11-01T03:10:00+00:00')
+    sample_2 = WattSample(watts=3000, moment='2019-11-01T03:40:00+00:00')
+    energies = list(stream_by_period([sample_1, sample_2],
+                                     NemSettlementPeriod))
+
+    assert [energy.start for energy in energies] == [
+        NemSettlementPeriod('2019-11-01T13:00:00').start,
+        NemSettlementPeriod('2019-11-01T13:30:00').start]
+    assert energies[0].kwh == pytest.approx(0.5)
+    assert energies[1].kwh == pytest.approx(1.5)
+
+
+def test_out_of_order_samples_rejected():
+    """A sample earlier than the last one aggregated is an error."""
+    samples = _samples()
+    aggregator = PeriodEnergyAggregator(NemSettlementPeriod)
+    aggregator.push(samples[2])
+
+    with pytest.raises(OutOfOrderSample):
+        aggregator.push(samples[1])
+    with pytest.raises(OutOfOrderSample):
+        aggregator.push_many(samples[:2])
+    with pytest.raises(OutOfOrderSample):
+        aggregator.push_many([samples[4], samples[3]])
+
+
+def test_long_stream_keeps_constant_state():
+    """Only the open period is held, however many samples are pushed."""
+    epoch_ns = np.datetime64('2019-11-01T00:00:00', 'ns').view(np.int64) + \
+        np.arange(0, 24 * 3600, 10, dtype=np.int64) * 1000 * 1000 * 1000
+    samples = WattSampleArray(epoch_ns=epoch_ns,
+                              watts=np.full(len(epoch_ns), 2000.0))
+
+    aggregator = PeriodEnergyAggregator(NemSettlementPeriod)
+    finished = []
+    for start in range(0, len(samples), 1000):
+        finished += aggregator.push_many(samples[start:start + 1000])
+    finished += aggregator.flush()
+
+    assert len(finished) == 48
+    assert all(energy.kwh == pytest.approx(1.0) for energy in finished)
+
+
+def test_late_samples_revise_their_period():
+    """A late sample reports its period again, with the next revision."""
+    samples = _samples()
+    aggregator = WatermarkEnergyAggregator(NemSettlementPeriod,
+                                           lateness=timedelta(minutes=45))
+
+    reports = aggregator.push_many([samples[0], samples[2]])
+    assert [report.revision for report in reports] == [0]
+    assert reports[0].energy.kwh == 5.0
+
+    # 13:30 is reported from the 13:45 sample alone.
+    reports = aggregator.push(samples[3])
+    assert [report.revision for report in reports] == [0]
+    assert reports[0].energy.kwh == pytest.approx(20 * (30 / 60))
+
+    reports = aggregator.push(samples[1])
+    assert len(reports) == 1
+    assert reports[0].revision == 1
+    assert reports[0].energy.start == NemSettlementPeriod(
+        '2019-11-01T13:30:00').start
+    assert reports[0].energy.kwh == pytest.approx(
+        (15 * (15 / 60)) + (20 * (15 / 60)))
+
+
+def test_samples_behind_the_watermark_are_dropped():
+    """A sample in a period that ended before the watermark is dropped."""
+    samples = _samples()
+    aggregator = WatermarkEnergyAggregator(NemSettlementPeriod,
+                                           lateness=timedelta(minutes=10))
+    aggregator.push_many(samples[2:4])
+
+    assert aggregator.push(samples[0]) == []
+    assert aggregator.dropped == 1
+    assert aggregator.watermark == to_epoch_ns(NemSettlementPeriod.localize(
+        '2019-11-01T13:55:00'))
+
+    # 13:30 ends after the watermark, so can still be revised.
+    assert aggregator.push(samples[1])[0].revision == 1
+    assert aggregator.dropped == 1
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_shuffled_stream_converges_to_by_period(seed):
+    """The last revision of each period matches by_period on sorted samples."""
+    samples = _samples()
+    expected = ElectricalEnergy.from_power_samples(samples).by_period(
+        NemSettlementPeriod)
+
+    shuffled = list(samples)
+    random.Random(seed).shuffle(shuffled)
+    aggregator = WatermarkEnergyAggregator(NemSettlementPeriod,
+                                           lateness=timedelta(hours=6))
+    latest = {}
+    for sample in shuffled:
+        for report in aggregator.push(sample):
+            latest[report.energy.start] = report.energy
+    for report in aggregator.flush():
+        latest[report.energy.start] = report.energy
+
+    _assert_same_energies([latest[start] for start in sorted(latest)],
+                          expected)
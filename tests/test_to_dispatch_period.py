@@ -0,0 +1,17 @@
+"""Are the units usable within pandas."""
+from pandas import Series
+
+from electric_units.pandas_compat import NemDispatchPeriodArray as PeriodType
+from electric_units.pandas_compat import to_dispatch_period
+
+
+def test_pandas_extension():
+    """Can you convert a series of strings to dispatch periods."""
+    series_of_strings = Series([
+        '2019-01-01T10:00:00',
+        '2019-01-01T10:05:00',
+    ])
+    series_of_periods = to_dispatch_period(PeriodType, series_of_strings)
+
+    assert series_of_periods.dtype == 'nem_dispatch_period'
+    assert series_of_periods[1].period_id == 74
@@ -47,6 +47,14 @@ def test_settlement_period(sample_momemt, period_moment):
     assert sample.settlement_period(NemSettlementPeriod) == period
 
 
+def test_settlement_period_keeps_moment():
+    """The period is made from the sample's own moment, not interned."""
+    sample = WattSample(watts=1, moment='2020-01-01T12:05:00')
+    period = sample.settlement_period(NemSettlementPeriod)
+    assert period.moment == NemSettlementPeriod(sample.moment).moment
+    assert period.moment != period.start
+
+
 def test_can_compare():
     """We can compare the size of two samples.
 
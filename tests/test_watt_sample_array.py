@@ -0,0 +1,75 @@
+"""Test the WattSampleArray object."""
+from datetime import datetime
+
+import numpy as np
+from pandas import DataFrame, to_datetime
+from pytz import timezone
+import pytest
+
+from electric_units import (
+    ElectricalEnergy, NemSettlementPeriod, WattSample, WattSampleArray)
+
+
+def test_from_arrays_without_copy():
+    """NumPy columns are used as they are."""
+    epoch_ns = np.array([0, 60 * 10 ** 9], dtype=np.int64)
+    watts = np.array([1000.0, 2000.0])
+    samples = WattSampleArray(epoch_ns=epoch_ns, watts=watts)
+
+    assert samples.epoch_ns is epoch_ns
+    assert samples.watts is watts
+    assert len(samples) == 2
+    assert samples[1] == WattSample(watts=2000, moment='1970-01-01T00:01:00')
+
+
+def test_from_samples():
+    """A list of samples becomes columns, and indexes back to samples."""
+    samples = [
+        WattSample(watts=1000, moment='2019-11-01T13:30:00'),
+        WattSample(watts=10000, moment='2019-11-01T13:00:00'),
+    ]
+    array = WattSampleArray.from_samples(samples)
+
+    assert list(array) == samples
+    assert list(array.sorted()) == samples[::-1]
+    assert isinstance(array[:1], WattSampleArray)
+
+    with pytest.raises(TypeError):
+        WattSampleArray.from_samples([
+            WattSample(watts=1, moment='2019-11-01T13:30:00'),
+            WattSample(watts=1, moment='2019-11-01T13:30:00+10:00'),
+        ])
+
+
+def test_from_pandas():
+    """Naive and aware pandas columns are viewed in place."""
+    frame = DataFrame({
+        'moment': to_datetime(['2019-11-01T13:00:00', '2019-11-01T13:30:00']),
+        'watts': [10000.0, 1000.0],
+    })
+    samples = WattSampleArray.from_pandas(frame.moment, frame.watts)
+    assert samples[0] == WattSample(watts=10000, moment='2019-11-01T13:00:00')
+    assert np.shares_memory(samples.watts, frame.watts.values)
+
+    aest = frame.moment.dt.tz_localize('Etc/GMT-10')
+    aware = WattSampleArray.from_pandas(aest, frame.watts)
+    assert aware.moment_at(1) == timezone('Etc/GMT-10').localize(
+        datetime(2019, 11, 1, 13, 30))
+
+
+def test_energy_from_array():
+    """Energy objects accept the array in place of a list."""
+    samples = WattSampleArray(
+        epoch_ns=np.array(['2019-11-01T13:30', '2019-11-01T13:00'],
+                          dtype='datetime64[ns]'),
+        watts=[1000, 10000])
+    energy = ElectricalEnergy.from_power_samples(samples)
+
+    assert energy == ElectricalEnergy(
+        kwh=2.75, start='2019-11-01T13:00:00', end='2019-11-01T13:30:00')
+    assert isinstance(energy.samples, WattSampleArray)
+    assert len(energy.by_period(NemSettlementPeriod)) == 2
+    assert samples.settlement_period(NemSettlementPeriod) == [
+        NemSettlementPeriod('2019-11-01T13:30:00'),
+        NemSettlementPeriod('2019-11-01T13:00:00'),
+    ]